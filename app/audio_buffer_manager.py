@@ -1,3 +1,5 @@
+import time
+
 import numpy as np
 from scipy.signal import resample_poly
 
@@ -14,6 +16,7 @@ class AudioBufferManager:
         target_sample_rate: int = 16000,
         window_size_sec: float = 2.0,
         step_size_sec: float = 1.0,
+        history_sec: float = 0.0,
     ):
         self.input_sr = input_sample_rate
         self.target_sr = target_sample_rate
@@ -21,17 +24,33 @@ class AudioBufferManager:
         self.window_size_samples = int(window_size_sec * target_sample_rate)
         self.step_size_samples = int(step_size_sec * target_sample_rate)
 
-        self.buffer = np.zeros((0,), dtype=np.float32)
+        # Already-emitted audio kept for get_span (e.g. re-transcription)
+        self.history_samples = int(history_sec * target_sample_rate)
+
+        # Preallocated storage; chunks are written in place (no per-chunk
+        # concatenate). self.buffer is a view of the valid part.
+        self._storage = np.zeros(
+            (self.window_size_samples * 2,), dtype=np.float32
+        )
+        self._length = 0
 
         self._last_emitted_sample = 0
 
+        # Absolute position (in target-rate samples) of buffer[0]
+        self._buffer_offset = 0
+
         print(
             f"[AudioBufferManager] Initialized | "
             f"input_sr={self.input_sr}, target_sr={self.target_sr}, "
             f"window={self.window_size_samples} samples, "
-            f"step={self.step_size_samples} samples"
+            f"step={self.step_size_samples} samples, "
+            f"history={self.history_samples} samples"
         )
 
+    @property
+    def buffer(self) -> np.ndarray:
+        return self._storage[: self._length]
+
     def _to_mono(self, chunk: np.ndarray) -> np.ndarray:
         """
         Convert (frames, channels) → mono (frames,)
@@ -39,7 +58,42 @@ class AudioBufferManager:
         if chunk.ndim == 1:
             return chunk
 
-        return np.mean(chunk, axis=1)
+        # Single channel: a view, no copy
+        if chunk.shape[1] == 1:
+            return chunk[:, 0]
+
+        return np.mean(chunk, axis=1, dtype=np.float32)
+
+    def _to_float(
+        self,
+        mono: np.ndarray,
+        source_dtype: np.dtype,
+    ) -> np.ndarray:
+        """
+        Scale integer PCM (e.g. int16) to float32 in [-1, 1).
+        Float input is passed through unchanged.
+        """
+        if not np.issubdtype(source_dtype, np.integer):
+            return mono
+
+        scale = 1.0 / (np.iinfo(source_dtype).max + 1)
+        return np.multiply(mono, scale, dtype=np.float32)
+
+    def _append(self, samples: np.ndarray) -> None:
+        """
+        Write samples into storage, growing it only when needed.
+        """
+        needed = self._length + len(samples)
+
+        if needed > len(self._storage):
+            grown = np.zeros(
+                (max(needed, len(self._storage) * 2),), dtype=np.float32
+            )
+            grown[: self._length] = self._storage[: self._length]
+            self._storage = grown
+
+        self._storage[self._length : needed] = samples
+        self._length = needed
 
     def _resample(self, mono_chunk: np.ndarray) -> np.ndarray:
         """
@@ -62,28 +116,85 @@ class AudioBufferManager:
             List of numpy arrays:
             Each array shape = (window_size_samples,)
         """
-        mono = self._to_mono(chunk)
+        return [w["audio"] for w in self.add_chunk_timed(chunk)]
+
+    def add_chunk_timed(self, chunk: np.ndarray) -> list[dict]:
+        """
+        Same as add_chunk, but each window carries its audio-time position.
+
+        Returns:
+            List of dicts:
+            {
+                "audio": np.ndarray,     # shape = (window_size_samples,)
+                "start_sample": int,     # absolute, at target_sample_rate
+                "end_sample": int,       # exclusive
+                "captured_at": float     # wall-clock time of emission
+            }
+        """
+        mono = self._to_float(self._to_mono(chunk), chunk.dtype)
         resampled = self._resample(mono)
 
-        self.buffer = np.concatenate([self.buffer, resampled])
+        self._append(resampled)
 
-        windows: list[np.ndarray] = []
+        captured_at = time.time()
+        windows: list[dict] = []
 
         while (
-            len(self.buffer) - self._last_emitted_sample
+            self._length - self._last_emitted_sample
             >= self.window_size_samples
         ):
             start = self._last_emitted_sample
             end = start + self.window_size_samples
 
-            window = self.buffer[start:end]
-            windows.append(window.copy())
+            window = self._storage[start:end]
+            windows.append(
+                {
+                    "audio": window.copy(),
+                    "start_sample": self._buffer_offset + start,
+                    "end_sample": self._buffer_offset + end,
+                    "captured_at": captured_at,
+                }
+            )
 
             self._last_emitted_sample += self.step_size_samples
 
-        # Optional memory cleanup
-        if self._last_emitted_sample > self.window_size_samples:
-            self.buffer = self.buffer[self._last_emitted_sample :]
-            self._last_emitted_sample = 0
+        # Optional memory cleanup (move the tail to the front, in place)
+        keep_from = max(0, self._last_emitted_sample - self.history_samples)
+        if keep_from > self.window_size_samples:
+            tail = self._length - keep_from
+            self._storage[:tail] = self._storage[keep_from : self._length]
+            self._length = tail
+            self._buffer_offset += keep_from
+            self._last_emitted_sample -= keep_from
 
         return windows
+
+    def get_span(self, start_sample: int, end_sample: int) -> np.ndarray | None:
+        """
+        Copy of audio between absolute positions, or None if it is no
+        longer (or not yet) buffered. Needs history_sec > 0 for spans
+        older than the current window.
+        """
+        start = start_sample - self._buffer_offset
+        end = end_sample - self._buffer_offset
+
+        if start < 0 or end > self._length or end <= start:
+            return None
+
+        return self._storage[start:end].copy()
+
+    def state_dict(self) -> dict:
+        """
+        Unconsumed tail of the buffer plus positions, for checkpointing.
+        """
+        return {
+            "buffer": self.buffer.copy(),
+            "last_emitted_sample": self._last_emitted_sample,
+            "buffer_offset": self._buffer_offset,
+        }
+
+    def load_state(self, state: dict) -> None:
+        self._length = 0
+        self._append(np.asarray(state["buffer"], dtype=np.float32))
+        self._last_emitted_sample = state["last_emitted_sample"]
+        self._buffer_offset = state["buffer_offset"]
@@ -0,0 +1,105 @@
+# checkpoint_manager.py
+
+import base64
+import json
+import os
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+
+class CheckpointManager:
+    """
+    Periodically persists pipeline state so a long meeting can resume
+    after a crash without re-transcribing audio.
+
+    State is a plain dict (numpy arrays allowed) written atomically
+    as a single JSON file.
+    """
+
+    def __init__(
+        self,
+        path: str = "output/checkpoint.json",
+        interval_sec: float = 30.0,
+    ):
+        self.path = path
+        self.interval_sec = interval_sec
+
+        self._last_saved = time.monotonic()
+
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        print(
+            f"[CheckpointManager] Initialized | "
+            f"path={self.path}, interval={self.interval_sec}s"
+        )
+
+    # -------------------------------------------------
+    # PUBLIC API
+    # -------------------------------------------------
+
+    def due(self) -> bool:
+        return time.monotonic() - self._last_saved >= self.interval_sec
+
+    def save(self, state: dict) -> None:
+        tmp_path = self.path + ".tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._encode(state), f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Atomic swap: a crash mid-write never corrupts the last checkpoint
+        os.replace(tmp_path, self.path)
+        self._last_saved = time.monotonic()
+
+    def load(self) -> Optional[dict]:
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            state = self._decode(json.load(f))
+
+        print(f"[CheckpointManager] Resuming from {self.path}")
+        return state
+
+    def clear(self) -> None:
+        """
+        Remove the checkpoint after a clean finish.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    # -------------------------------------------------
+    # ENCODING
+    # -------------------------------------------------
+
+    def _encode(self, value: Any) -> Any:
+        if isinstance(value, np.ndarray):
+            return {
+                "__ndarray__": base64.b64encode(
+                    np.ascontiguousarray(value).tobytes()
+                ).decode("ascii"),
+                "dtype": str(value.dtype),
+                "shape": list(value.shape),
+            }
+        if isinstance(value, dict):
+            return {str(k): self._encode(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._encode(v) for v in value]
+        return value
+
+    def _decode(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if "__ndarray__" in value:
+                data = base64.b64decode(value["__ndarray__"])
+                return np.frombuffer(data, dtype=value["dtype"]).reshape(
+                    value["shape"]
+                )
+            return {k: self._decode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._decode(v) for v in value]
+        return value
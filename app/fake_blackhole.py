@@ -43,9 +43,14 @@ class FakeBlackHole:
             f"frames={len(self.audio)}"
         )
 
-    def stream(self, on_audio_chunk: Callable[[np.ndarray], None]) -> None:
+    def stream(
+        self,
+        on_audio_chunk: Callable[[np.ndarray], None],
+        start_frame: int = 0,
+    ) -> None:
         """
-        Start streaming audio chunks.
+        Start streaming audio chunks, optionally from start_frame
+        (e.g. when resuming from a checkpoint).
 
         on_audio_chunk receives numpy.ndarray:
         shape = (frame_size, channels)
@@ -55,9 +60,9 @@ class FakeBlackHole:
             raise RuntimeError("Audio not loaded. Call load() first.")
 
         total_frames = len(self.audio)
-        idx = 0
+        idx = start_frame
 
-        print("[FakeBlackHole] Streaming started")
+        print(f"[FakeBlackHole] Streaming started | start_frame={idx}")
 
         while idx + self.frame_size <= total_frames:
             chunk = self.audio[idx : idx + self.frame_size]
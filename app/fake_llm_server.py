@@ -0,0 +1,386 @@
+# fake_llm_server.py
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+
+class FakeLLMServer:
+    """
+    Simulates an OpenAI-compatible chat-completions endpoint for load and
+    failure testing (LLMClient points at it via LLM_BASE_URL).
+
+    Replies are deterministic and derived from the prompt. Latency,
+    errors and timeouts are injected from a seeded random source.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8089,
+        latency_dist: str = "lognormal",
+        latency_ms: float = 300.0,
+        latency_spread: float = 0.5,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        hang_sec: float = 30.0,
+        seed: int = 0,
+    ):
+        """
+        latency_dist:
+            "fixed"     → latency_ms
+            "uniform"   → latency_ms * (1 ± latency_spread)
+            "lognormal" → median latency_ms, sigma latency_spread
+            "pareto"    → latency_ms * pareto(alpha = 1 / latency_spread)
+        """
+        if latency_dist not in ("fixed", "uniform", "lognormal", "pareto"):
+            raise ValueError(f"Unknown latency_dist: {latency_dist}")
+
+        self.host = host
+        self.port = port
+        self.latency_dist = latency_dist
+        self.latency_ms = latency_ms
+        self.latency_spread = latency_spread
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang_sec = hang_sec
+
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set[asyncio.Task] = set()
+        self._request_count = 0
+
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "streamed": 0,
+        }
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    # -------------------------------------------------
+    # LIFECYCLE
+    # -------------------------------------------------
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        # port=0 → pick a free port
+        self.port = self._server.sockets[0].getsockname()[1]
+
+        print(
+            f"[FakeLLMServer] Listening on {self.base_url} | "
+            f"latency={self.latency_dist}({self.latency_ms}ms, "
+            f"spread={self.latency_spread}), "
+            f"error_rate={self.error_rate}, "
+            f"timeout_rate={self.timeout_rate}"
+        )
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+
+            # Idle keep-alive and hanging (timeout-injected) connections
+            for task in list(self._connections):
+                task.cancel()
+            if self._connections:
+                await asyncio.wait(self._connections)
+
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    # -------------------------------------------------
+    # HTTP
+    # -------------------------------------------------
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+
+        try:
+            # HTTP/1.1 keep-alive: serve requests until the client closes
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+
+                method, path, body = request
+                if method == "POST" and path.endswith("/chat/completions"):
+                    await self._chat_completions(writer, body)
+                else:
+                    await self._send_json(
+                        writer, 404, {"error": {"message": "not found"}}
+                    )
+        except (
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            asyncio.CancelledError,
+        ):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(
+        self,
+        reader: asyncio.StreamReader,
+    ) -> Optional[Tuple[str, str, bytes]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+
+        lines = head.decode("latin-1").split("\r\n")
+        method, path, _ = lines[0].split(" ", 2)
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", "0"))
+        body = await reader.readexactly(length) if length else b""
+
+        return method, path, body
+
+    async def _send_json(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: dict,
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        reason = {200: "OK", 404: "Not Found", 500: "Internal Server Error"}
+
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {reason.get(status, 'Error')}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        await writer.drain()
+
+    # -------------------------------------------------
+    # CHAT COMPLETIONS
+    # -------------------------------------------------
+
+    async def _chat_completions(
+        self,
+        writer: asyncio.StreamWriter,
+        body: bytes,
+    ) -> None:
+        self.stats["requests"] += 1
+        self._request_count += 1
+        request_id = f"chatcmpl-fake-{self._request_count}"
+
+        payload = json.loads(body or b"{}")
+        model = payload.get("model", "fake")
+        messages = payload.get("messages", [])
+        prompt = messages[-1]["content"] if messages else ""
+
+        roll = self._rng.random()
+
+        if roll < self.timeout_rate:
+            self.stats["timeouts"] += 1
+            await asyncio.sleep(self.hang_sec)
+            return
+
+        await asyncio.sleep(self._sample_latency_sec())
+
+        if roll < self.timeout_rate + self.error_rate:
+            self.stats["errors"] += 1
+            await self._send_json(
+                writer,
+                500,
+                {
+                    "error": {
+                        "message": "Injected failure",
+                        "type": "server_error",
+                    }
+                },
+            )
+            return
+
+        content = self._reply(prompt)
+
+        if payload.get("stream"):
+            self.stats["streamed"] += 1
+            await self._stream(writer, request_id, model, content)
+            return
+
+        await self._send_json(
+            writer,
+            200,
+            {
+                "id": request_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": len(prompt.split()),
+                    "completion_tokens": len(content.split()),
+                    "total_tokens": len(prompt.split())
+                    + len(content.split()),
+                },
+            },
+        )
+
+    async def _stream(
+        self,
+        writer: asyncio.StreamWriter,
+        request_id: str,
+        model: str,
+        content: str,
+    ) -> None:
+        """
+        Server-sent events, one delta per few characters.
+        """
+        writer.write(
+            (
+                "HTTP/1.1 200 OK\r\n"
+                "Content-Type: text/event-stream\r\n"
+                "Transfer-Encoding: chunked\r\n"
+                "\r\n"
+            ).encode("latin-1")
+        )
+
+        def chunk(delta: dict, finish_reason: Optional[str]) -> dict:
+            return {
+                "id": request_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": delta,
+                        "finish_reason": finish_reason,
+                    }
+                ],
+            }
+
+        events = [chunk({"role": "assistant", "content": ""}, None)]
+        for i in range(0, len(content), 8):
+            events.append(chunk({"content": content[i : i + 8]}, None))
+        events.append(chunk({}, "stop"))
+
+        for event in events:
+            self._write_chunk(writer, f"data: {json.dumps(event)}\n\n")
+            await writer.drain()
+            await asyncio.sleep(0.005)
+
+        self._write_chunk(writer, "data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _write_chunk(self, writer: asyncio.StreamWriter, text: str) -> None:
+        data = text.encode("utf-8")
+        writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+
+    # -------------------------------------------------
+    # DETERMINISTIC REPLIES
+    # -------------------------------------------------
+
+    def _reply(self, prompt: str) -> str:
+        """
+        Refinement prompts get the JSON LLMClient expects; anything else
+        (summaries) gets a short text built from the listed lines.
+        """
+        sentence = re.search(r'Sentence:\s*"(.*)"', prompt, re.DOTALL)
+        if sentence:
+            text = sentence.group(1).strip()
+            langs = re.search(
+                r"Translate it into each of these languages: (.+?)\.\n",
+                prompt,
+            )
+            targets = [
+                lang.strip()
+                for lang in (langs.group(1) if langs else "").split(",")
+                if lang.strip() and lang.strip() != "(none)"
+            ]
+
+            return json.dumps(
+                {
+                    "refined_en": text,
+                    "translations": {
+                        lang: f"[{lang}] {text}" for lang in targets
+                    },
+                },
+                ensure_ascii=False,
+            )
+
+        items = re.findall(r"^- (.+)$", prompt, re.MULTILINE)
+        words = " ".join(items).split()[:40]
+        return " ".join(words) or "Nothing to summarize."
+
+    def _sample_latency_sec(self) -> float:
+        base = self.latency_ms
+
+        if self.latency_dist == "fixed":
+            ms = base
+        elif self.latency_dist == "uniform":
+            ms = base * self._rng.uniform(
+                1 - self.latency_spread, 1 + self.latency_spread
+            )
+        elif self.latency_dist == "lognormal":
+            ms = base * self._rng.lognormvariate(0.0, self.latency_spread)
+        else:
+            ms = base * self._rng.paretovariate(1 / self.latency_spread)
+
+        return max(0.0, ms) / 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=FakeLLMServer.__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-dist", default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--hang-sec", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(
+        host=args.host,
+        port=args.port,
+        latency_dist=args.latency_dist,
+        latency_ms=args.latency_ms,
+        latency_spread=args.latency_spread,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        hang_sec=args.hang_sec,
+        seed=args.seed,
+    )
+
+    asyncio.run(server.serve_forever())
@@ -1,12 +1,16 @@
 # llm_client.py
 
 import asyncio
+import json
 import os
-from typing import Optional, Dict
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 
+from app.llm_hedge_policy import HedgePolicy
+
 # Load .env once
 load_dotenv()
 
@@ -22,73 +26,310 @@ class LLMClient:
         model: Optional[str] = None,
         target_lang: Optional[str] = None,
         timeout_sec: Optional[float] = None,
+        summary_timeout_sec: Optional[float] = None,
+        base_url: Optional[str] = None,
+        target_langs: Optional[List[str]] = None,
+        cache_size: int = 1024,
+        hedge: Optional[bool] = None,
     ):
         self.model = model or os.getenv("LLM_MODEL", "gpt-4.1-mini")
         self.target_lang = target_lang or os.getenv("LLM_TARGET_LANG", "tr")
+
+        # Multi-target fan-out; first language is the legacy "translated"
+        env_langs = os.getenv("LLM_TARGET_LANGS", "")
+        self.target_langs = target_langs or [
+            lang.strip() for lang in env_langs.split(",") if lang.strip()
+        ] or [self.target_lang]
+        self.target_lang = self.target_langs[0]
+
+        # Refinement keyed by (sentence, source_lang), translations by
+        # (sentence, source_lang, target), so a newly added target
+        # language only requests what's missing
+        self.cache_size = cache_size
+        self._refined_cache: OrderedDict[
+            Tuple[str, Optional[str]], str
+        ] = OrderedDict()
+        self._translation_cache: OrderedDict[
+            Tuple[str, Optional[str], str], str
+        ] = OrderedDict()
         self.timeout_sec = (
             timeout_sec
             if timeout_sec is not None
             else float(os.getenv("LLM_TIMEOUT_SEC", "1.0"))
         )
+        # Summaries are off the caption path and may take longer
+        self.summary_timeout_sec = (
+            summary_timeout_sec
+            if summary_timeout_sec is not None
+            else float(os.getenv("LLM_SUMMARY_TIMEOUT_SEC", "10.0"))
+        )
+
+        # Optional OpenAI-compatible endpoint (e.g. FakeLLMServer)
+        self.base_url = base_url or os.getenv("LLM_BASE_URL") or None
 
         self.client = AsyncOpenAI(
             api_key=os.getenv("OPENAI_API_KEY")
+            or ("local" if self.base_url else None),
+            base_url=self.base_url,
+            max_retries=0,  # latency-first: no SDK-level retries either
+        )
+
+        # Optional hedged refinement calls (caption path only)
+        if hedge is None:
+            hedge = os.getenv("LLM_HEDGE", "0") == "1"
+        self.hedge_policy = (
+            HedgePolicy(
+                percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "0.9")),
+                budget=float(os.getenv("LLM_HEDGE_BUDGET", "0.1")),
+                min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+            )
+            if hedge
+            else None
         )
 
         print(
             "[LLMClient] Initialized | "
             f"model={self.model}, "
-            f"target_lang={self.target_lang}, "
-            f"timeout={self.timeout_sec}s"
+            f"target_langs={','.join(self.target_langs)}, "
+            f"timeout={self.timeout_sec}s, "
+            f"hedge={'on' if self.hedge_policy else 'off'}, "
+            f"base_url={self.base_url or 'default'}"
         )
 
+    def set_target_langs(self, target_langs: List[str]) -> None:
+        """
+        Change target languages mid-meeting (cached ones are not re-requested).
+        """
+        self.target_langs = list(target_langs)
+        self.target_lang = self.target_langs[0]
+
     async def refine_and_translate(
         self,
         sentence: str,
-    ) -> Optional[Dict[str, str]]:
+        source_lang: Optional[str] = None,
+        target_langs: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, object]]:
         """
+        source_lang: detected spoken language of the sentence, if known.
+        target_langs: defaults to self.target_langs.
+
+        Returns None on failure, including when the first target
+        language is missing from the reply. Other missing languages are
+        logged, left out and re-requested next time.
+
         Returns:
         {
             "refined_en": "...",
-            "translated": "..."
+            "translated": "...",            # first target language
+            "translations": {"tr": "...", "de": "..."}
+        }
+        """
+        langs = list(target_langs or self.target_langs)
+        key = (sentence, source_lang)
+
+        refined = self._refined_cache.get(key)
+        missing = [
+            lang
+            for lang in langs
+            if key + (lang,) not in self._translation_cache
+        ]
+
+        if refined is None or missing:
+            response = await self._request_refinement(
+                sentence, source_lang, missing
+            )
+
+            # A failed top-up still leaves the cached refinement (and
+            # whatever translations are cached) usable
+            if response is None and refined is None:
+                return None
+
+            if response is not None:
+                if refined is None:
+                    refined = response["refined_en"]
+                    self._cache_put(self._refined_cache, key, refined)
+
+                for lang, text in response["translations"].items():
+                    if lang in missing and text.strip():
+                        self._cache_put(
+                            self._translation_cache, key + (lang,), text
+                        )
+
+        translations = {
+            lang: self._translation_cache[key + (lang,)]
+            for lang in langs
+            if key + (lang,) in self._translation_cache
         }
+
+        absent = [lang for lang in langs if lang not in translations]
+        if absent:
+            print(f"[LLMClient] Reply missing translations: {absent}")
+
+            # No caption for the primary language → fail, don't commit ""
+            if langs[0] in absent:
+                return None
+
+        return {
+            "refined_en": refined,
+            "translated": translations.get(langs[0], ""),
+            "translations": translations,
+        }
+
+    async def _request_refinement(
+        self,
+        sentence: str,
+        source_lang: Optional[str],
+        langs: List[str],
+    ) -> Optional[Dict[str, object]]:
+        """
+        One structured call: refined English plus every requested language.
         """
+        source_hint = (
+            f"The sentence was spoken in language code '{source_lang}'.\n"
+            if source_lang
+            else ""
+        )
+        lang_list = ", ".join(langs)
+        translations_template = ", ".join(
+            f'"{lang}": "..."' for lang in langs
+        )
+
         prompt = f"""
 You are a professional meeting transcript editor.
-
+{source_hint}
 Task:
 1. Rewrite the sentence in clean, natural English.
 2. Remove repetitions or filler words.
-3. Translate it into {self.target_lang}.
+3. Translate it into each of these languages: {lang_list or "(none)"}.
 
 Return STRICT JSON:
 {{
   "refined_en": "...",
-  "translated": "..."
+  "translations": {{{translations_template}}}
 }}
 
 Sentence:
 \"{sentence}\"
 """
 
+        content = await self._chat(
+            prompt, self.timeout_sec, json_mode=True, hedge=True
+        )
+        if content is None:
+            return None
+
         try:
-            response = await asyncio.wait_for(
-                self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You edit meeting transcripts.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    temperature=0.2,
-                ),
-                timeout=self.timeout_sec,
+            data = json.loads(content)
+            translations = data.get("translations") or {}
+            return {
+                "refined_en": str(data["refined_en"]),
+                "translations": {
+                    str(k): str(v) for k, v in translations.items()
+                },
+            }
+        except Exception as e:
+            print("[LLMClient] LLM returned unparsable content")
+            print("Exception repr:", repr(e))
+            return None
+
+    def _cache_put(self, cache: OrderedDict, key, value) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+
+        # Translation cache holds several entries per sentence
+        limit = self.cache_size * max(1, len(self.target_langs))
+        if cache is self._refined_cache:
+            limit = self.cache_size
+
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+    async def summarize_block(
+        self,
+        sentences: List[str],
+        max_words: int = 80,
+    ) -> Optional[str]:
+        """
+        Summarize one fixed-size block of refined transcript sentences.
+        """
+        transcript = "\n".join(f"- {s}" for s in sentences)
+
+        prompt = f"""
+You are summarizing part of a meeting transcript.
+
+Task:
+Summarize the key points, decisions and action items below
+in at most {max_words} words of plain English.
+
+Transcript:
+{transcript}
+"""
+        return await self._chat(prompt, self.summary_timeout_sec)
+
+    async def merge_summaries(
+        self,
+        running_summary: str,
+        block_summaries: List[str],
+        max_words: int = 150,
+    ) -> Optional[str]:
+        """
+        Merge newer block summaries into the running meeting summary.
+        """
+        updates = "\n".join(f"- {s}" for s in block_summaries)
+
+        prompt = f"""
+You maintain a rolling summary of an ongoing meeting.
+
+Task:
+Update the summary with the new parts of the meeting.
+Keep decisions and action items, drop details that no longer matter.
+Use at most {max_words} words of plain English.
+
+Current summary:
+{running_summary or "(empty)"}
+
+New parts:
+{updates}
+"""
+        return await self._chat(prompt, self.summary_timeout_sec)
+
+    async def _chat(
+        self,
+        prompt: str,
+        timeout_sec: float,
+        json_mode: bool = False,
+        hedge: bool = False,
+    ) -> Optional[str]:
+        """
+        Single chat completion. No retries (latency-first); with hedge=True
+        and a hedge policy, a slow call may race one identical backup
+        within the same timeout.
+        """
+        extra = (
+            {"response_format": {"type": "json_object"}} if json_mode else {}
+        )
+
+        def create():
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You edit meeting transcripts.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.2,
+                **extra,
             )
 
-            content = response.choices[0].message.content
-            return eval(content)  # MVP-safe, trusted JSON
+        try:
+            if hedge and self.hedge_policy:
+                response = await self.hedge_policy.run(create, timeout_sec)
+            else:
+                response = await asyncio.wait_for(create(), timeout=timeout_sec)
+
+            return response.choices[0].message.content
 
         except Exception as e:
             print("[LLMClient] LLM failed")
@@ -4,15 +4,32 @@ from typing import Dict, Optional, Tuple
 class OrderedCommitQueue:
     def __init__(self):
         self.next_id = 1
-        self.pending: Dict[int, Dict[str, str]] = {}
+        self.pending: Dict[int, Optional[Dict[str, str]]] = {}
 
     def add_result(self, sentence_id: int, result: Dict[str, str]):
         self.pending[sentence_id] = result
 
-    def pop_ready(self) -> Optional[Tuple[int, Dict[str, str]]]:
+    def skip(self, sentence_id: int):
+        """
+        Mark a failed id so later results are not blocked behind it.
+        pop_ready returns it with a None result.
+        """
+        self.pending[sentence_id] = None
+
+    def pop_ready(self) -> Optional[Tuple[int, Optional[Dict[str, str]]]]:
         if self.next_id in self.pending:
             result = self.pending.pop(self.next_id)
             sid = self.next_id
             self.next_id += 1
             return sid, result
         return None
+
+    def state_dict(self) -> dict:
+        return {
+            "next_id": self.next_id,
+            "pending": {str(k): v for k, v in self.pending.items()},
+        }
+
+    def load_state(self, state: dict):
+        self.next_id = state["next_id"]
+        self.pending = {int(k): v for k, v in state["pending"].items()}
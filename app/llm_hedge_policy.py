@@ -0,0 +1,178 @@
+# llm_hedge_policy.py
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """
+    Hedged requests for tail latency: if an attempt has not returned by
+    the rolling `percentile` latency, one identical backup is fired. The
+    first successful response wins and the other attempt is cancelled.
+
+    Backups are paid from a token bucket that earns `budget` tokens per
+    request, so at most ~budget of all requests are hedged.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.9,
+        budget: float = 0.1,
+        min_samples: int = 20,
+        window: int = 200,
+        burst: float = 5.0,
+    ):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.burst = burst
+
+        # End-to-end latency of requests that were NOT hedged (timeouts
+        # recorded as the timeout). Hedged requests are left out: their
+        # primary is cancelled, so its latency is never observed.
+        self._unhedged: deque = deque(maxlen=window)
+        # Of those, the ones past the threshold at the time (the tail is
+        # only ~1 - percentile of requests; keep enough of it)
+        self._tail: deque = deque(maxlen=window)
+        self._tokens = 0.0
+
+        # Metrics
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+        self.latency_saved_sec = 0.0
+
+        print(
+            f"[HedgePolicy] Initialized | p{int(percentile * 100)} threshold, "
+            f"budget={budget}, min_samples={min_samples}, window={window}"
+        )
+
+    # -------------------------------------------------
+    # PUBLIC API
+    # -------------------------------------------------
+
+    def threshold(self) -> Optional[float]:
+        """
+        Current hedge delay in seconds, or None while warming up.
+        """
+        if len(self._unhedged) < self.min_samples:
+            return None
+
+        ordered = sorted(self._unhedged)
+        idx = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return ordered[idx]
+
+    async def run(
+        self,
+        make_call: Callable[[], Awaitable[T]],
+        timeout_sec: float,
+    ) -> T:
+        """
+        Await make_call() with hedging. timeout_sec bounds the whole
+        request (both attempts); raises asyncio.TimeoutError past it,
+        or the last attempt's exception if every attempt failed.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + timeout_sec
+
+        self.requests += 1
+        self._tokens = min(self.burst, self._tokens + self.budget)
+
+        attempts = {asyncio.ensure_future(make_call()): started}
+        backup = None
+
+        try:
+            threshold = self.threshold()
+            if threshold is not None and threshold < timeout_sec:
+                done, _ = await asyncio.wait(attempts, timeout=threshold)
+
+                if not done:
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        self.hedged += 1
+
+                        backup = asyncio.ensure_future(make_call())
+                        attempts[backup] = loop.time()
+                    else:
+                        self.budget_denied += 1
+
+            pending = set(attempts)
+            error: Optional[BaseException] = None
+
+            while pending:
+                remaining = deadline - loop.time()
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, remaining),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if backup is None:
+                        self._record_unhedged(timeout_sec)
+                    raise asyncio.TimeoutError()
+
+                for task in done:
+                    if task.exception() is not None:
+                        # A failed attempt is not a response; keep
+                        # waiting for the other one if it is in flight
+                        error = task.exception()
+                        continue
+
+                    elapsed = loop.time() - started
+                    if backup is None:
+                        self._record_unhedged(elapsed)
+                    elif task is backup:
+                        self.hedge_wins += 1
+                        # Primary is still running past `elapsed`; estimate
+                        # what it would have taken from the observed tail
+                        self.latency_saved_sec += (
+                            self._tail_mean(elapsed) - elapsed
+                        )
+
+                    return task.result()
+
+            raise error
+
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "budget_denied": self.budget_denied,
+            "threshold_sec": self.threshold() or 0.0,
+            "latency_saved_sec": self.latency_saved_sec,
+            "latency_saved_per_hedge_sec": (
+                self.latency_saved_sec / self.hedged if self.hedged else 0.0
+            ),
+        }
+
+    # -------------------------------------------------
+    # INTERNAL
+    # -------------------------------------------------
+
+    def _record_unhedged(self, latency: float) -> None:
+        threshold = self.threshold()
+        if threshold is not None and latency >= threshold:
+            self._tail.append(latency)
+
+        self._unhedged.append(latency)
+
+    def _tail_mean(self, at_least: float) -> float:
+        """
+        Mean latency of recent unhedged requests slower than at_least
+        (mostly budget-denied ones). The cancelled primary is known to
+        be slower than that, so this stands in for its latency.
+        """
+        tail = [s for s in self._tail if s >= at_least]
+        return sum(tail) / len(tail) if tail else at_least
@@ -0,0 +1,180 @@
+# llm_load_harness.py
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from app.fake_llm_server import FakeLLMServer
+from app.llm_client import LLMClient
+from app.output_manager import OutputManager
+from app.sentence_enricher import SentenceEnricher
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(q * len(ordered)))
+    return ordered[idx]
+
+
+async def run_load(
+    llm: LLMClient,
+    output: OutputManager,
+    num_sentences: int = 2000,
+    rate_per_sec: float = 100.0,
+) -> Dict[str, float]:
+    """
+    Drive sentences through SentenceEnricher (the same enrich →
+    ordered-commit → output path as main.py), arriving at rate_per_sec.
+
+    Returns throughput and latency percentiles (seconds):
+    - llm_*    : single refine_and_translate call
+    - commit_* : sentence finalized → committed in order
+                 (includes head-of-line blocking)
+    """
+    llm_latency: List[float] = []
+    commit_latency: List[float] = []
+    failures = 0
+    last_committed = 0
+    order_ok = True
+
+    def on_commit(sentence_id: int, result, meta: dict):
+        nonlocal failures, last_committed, order_ok
+
+        marks = meta["marks"]
+        llm_latency.append(marks["llm_done"] - marks["llm_requested"])
+        commit_latency.append(time.time() - marks["finalized"])
+
+        if result is None:
+            failures += 1
+
+        if sentence_id != last_committed + 1:
+            order_ok = False
+        last_committed = sentence_id
+
+    enricher = SentenceEnricher(
+        llm,
+        output,
+        on_commit=on_commit,
+        verbose=False,
+    )
+
+    interval = 1 / rate_per_sec
+    t0 = time.perf_counter()
+
+    for sentence_id in range(1, num_sentences + 1):
+        # Pace arrivals against the schedule, not against the last sleep
+        delay = t0 + (sentence_id - 1) * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        text = f"so um sentence number {sentence_id} is about the roadmap"
+        output.write_raw(sentence_id, text)
+        enricher.add_sentence(
+            sentence_id,
+            text,
+            marks={"finalized": time.time()},
+        )
+
+    await enricher.wait()
+
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "sentences": num_sentences,
+        "failures": failures,
+        "order_ok": order_ok and last_committed == num_sentences,
+        "elapsed_sec": elapsed,
+        "throughput_per_sec": num_sentences / elapsed,
+        "llm_p50": _percentile(llm_latency, 0.50),
+        "llm_p90": _percentile(llm_latency, 0.90),
+        "llm_p99": _percentile(llm_latency, 0.99),
+        "llm_max": max(llm_latency, default=0.0),
+        "commit_p50": _percentile(commit_latency, 0.50),
+        "commit_p90": _percentile(commit_latency, 0.90),
+        "commit_p99": _percentile(commit_latency, 0.99),
+        "commit_max": max(commit_latency, default=0.0),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    server: Optional[FakeLLMServer] = None
+    base_url = args.base_url
+
+    if not base_url:
+        server = FakeLLMServer(
+            port=0,
+            latency_dist=args.latency_dist,
+            latency_ms=args.latency_ms,
+            latency_spread=args.latency_spread,
+            error_rate=args.error_rate,
+            timeout_rate=args.timeout_rate,
+            seed=args.seed,
+        )
+        await server.start()
+        base_url = server.base_url
+
+    llm = LLMClient(
+        base_url=base_url,
+        timeout_sec=args.timeout,
+        hedge=args.hedge,
+    )
+
+    # Separate file, no index: the real transcript is left untouched
+    output = OutputManager(path=args.output, index_path="")
+    output.truncate(0)
+
+    report = await run_load(
+        llm,
+        output,
+        num_sentences=args.sentences,
+        rate_per_sec=args.rate,
+    )
+
+    print("\n[LLMLoadHarness] Report")
+    for key, value in report.items():
+        if isinstance(value, float):
+            print(f"  {key:>20} = {value:.4f}")
+        else:
+            print(f"  {key:>20} = {value}")
+
+    output.close()
+
+    if llm.hedge_policy:
+        print("\n[LLMLoadHarness] Hedging")
+        for key, value in llm.hedge_policy.stats().items():
+            if isinstance(value, float):
+                print(f"  {key:>28} = {value:.4f}")
+            else:
+                print(f"  {key:>28} = {value}")
+
+    if server:
+        print(f"  {'server':>20} = {server.stats}")
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load-test LLM enrichment + ordered commit."
+    )
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=100.0)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--output", default="output/llm_load_harness.jsonl")
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Hedge slow refinement calls (see LLM_HEDGE_* env vars)",
+    )
+    parser.add_argument("--latency-dist", default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,226 @@
+# meeting_summarizer.py
+
+import asyncio
+from typing import List, Tuple
+
+from app.llm_client import LLMClient
+from app.llm_commit_queue import OrderedCommitQueue
+from app.output_manager import OutputManager
+
+
+class RollingSummarizer:
+    """
+    Incremental, hierarchical meeting summary built on the committed
+    (refined) sentence stream.
+
+    Sentences are grouped into fixed-size blocks. Each block is summarized
+    once, and block summaries are merged into a bounded running summary,
+    so the cost of one update does not grow with meeting length.
+    """
+
+    def __init__(
+        self,
+        llm: LLMClient,
+        output: OutputManager,
+        block_size: int = 10,
+        refresh_every_blocks: int = 1,
+        block_summary_words: int = 80,
+        max_summary_words: int = 150,
+    ):
+        self.llm = llm
+        self.output = output
+        self.block_size = block_size
+        self.refresh_every_blocks = refresh_every_blocks
+        self.block_summary_words = block_summary_words
+        self.max_summary_words = max_summary_words
+
+        self.running_summary = ""
+
+        self._block: List[Tuple[int, str]] = []
+        # Sentences not yet covered by running_summary (for checkpointing)
+        self._uncovered: List[Tuple[int, str]] = []
+        self._next_block_index = 1
+        self._last_merged_sentence_id = 0
+
+        # Block summaries may finish out of order; merge strictly in order
+        self._block_order = OrderedCommitQueue()
+        # (first_sentence_id, last_sentence_id, block summary)
+        self._unmerged: List[Tuple[int, int, str]] = []
+        self._merge_lock = asyncio.Lock()
+
+        self._tasks: set[asyncio.Task] = set()
+
+        print(
+            f"[RollingSummarizer] Initialized | "
+            f"block_size={self.block_size}, "
+            f"refresh_every_blocks={self.refresh_every_blocks}, "
+            f"max_summary_words={self.max_summary_words}"
+        )
+
+    # -------------------------------------------------
+    # PUBLIC API
+    # -------------------------------------------------
+
+    def add_sentence(self, sentence_id: int, text: str) -> None:
+        """
+        Feed one committed sentence (in commit order).
+        """
+        self._block.append((sentence_id, text))
+        self._uncovered.append((sentence_id, text))
+
+        if len(self._block) >= self.block_size:
+            self._schedule_block(force_merge=False)
+
+    async def flush(self) -> None:
+        """
+        Summarize the trailing partial block and merge everything left.
+        """
+        if self._block:
+            self._schedule_block(force_merge=True)
+
+        if self._tasks:
+            await asyncio.wait(self._tasks)
+
+        if self._unmerged:
+            async with self._merge_lock:
+                await self._merge()
+
+    def state_dict(self) -> dict:
+        """
+        Running summary plus every sentence it does not cover yet.
+        In-flight block summaries are not saved; their sentences are.
+        """
+        return {
+            "running_summary": self.running_summary,
+            "last_merged_sentence_id": self._last_merged_sentence_id,
+            "uncovered": [list(item) for item in self._uncovered],
+        }
+
+    def load_state(self, state: dict) -> None:
+        """
+        Restore and re-feed uncovered sentences (requires a running loop).
+        """
+        self.running_summary = state["running_summary"]
+        self._last_merged_sentence_id = state["last_merged_sentence_id"]
+
+        for sentence_id, text in state["uncovered"]:
+            self.add_sentence(sentence_id, text)
+
+    # -------------------------------------------------
+    # INTERNAL
+    # -------------------------------------------------
+
+    def _schedule_block(self, force_merge: bool) -> None:
+        block = self._block
+        self._block = []
+
+        block_index = self._next_block_index
+        self._next_block_index += 1
+
+        task = asyncio.create_task(
+            self._process_block(block_index, block, force_merge)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process_block(
+        self,
+        block_index: int,
+        block: List[Tuple[int, str]],
+        force_merge: bool,
+    ) -> None:
+        summary = await self.llm.summarize_block(
+            [text for _, text in block],
+            max_words=self.block_summary_words,
+        )
+
+        # A failed block still advances the order (latency-first, no retries)
+        self._block_order.add_result(
+            block_index,
+            {
+                "summary": summary or "",
+                "first_sentence_id": block[0][0],
+                "last_sentence_id": block[-1][0],
+            },
+        )
+
+        async with self._merge_lock:
+            while True:
+                ready = self._block_order.pop_ready()
+                if not ready:
+                    break
+
+                _, result = ready
+                if result["summary"]:
+                    self._unmerged.append(
+                        (
+                            result["first_sentence_id"],
+                            result["last_sentence_id"],
+                            result["summary"],
+                        )
+                    )
+                else:
+                    print(
+                        f"⚠️ SUMMARY GAP #{result['first_sentence_id']}–"
+                        f"#{result['last_sentence_id']} → block failed"
+                    )
+                    self._last_merged_sentence_id = max(
+                        self._last_merged_sentence_id,
+                        result["last_sentence_id"],
+                    )
+
+            if self._unmerged and (
+                force_merge
+                or len(self._unmerged) >= self.refresh_every_blocks
+            ):
+                await self._merge()
+
+    async def _merge(self) -> None:
+        """
+        Merge pending block summaries into the running summary.
+        Caller holds _merge_lock.
+        """
+        merged = await self.llm.merge_summaries(
+            self.running_summary,
+            [summary for _, _, summary in self._unmerged],
+            max_words=self.max_summary_words,
+        )
+
+        if merged is None:
+            # Keep at most one refresh worth for the next attempt,
+            # so a failing provider never grows the merge prompt.
+            # Dropped blocks are left out of the summary, not claimed.
+            keep = self.refresh_every_blocks
+            dropped = self._unmerged[:-keep]
+            if dropped:
+                print(
+                    f"⚠️ SUMMARY GAP #{dropped[0][0]}–#{dropped[-1][1]} "
+                    f"→ merge failed"
+                )
+                self._last_merged_sentence_id = dropped[-1][1]
+                self._uncovered = [
+                    item
+                    for item in self._uncovered
+                    if item[0] > dropped[-1][1]
+                ]
+            self._unmerged = self._unmerged[-keep:]
+            return
+
+        # Only what this merge adds (earlier failed blocks are gaps)
+        first_id = self._unmerged[0][0]
+        last_id = self._unmerged[-1][1]
+
+        self.running_summary = merged.strip()
+        self._last_merged_sentence_id = last_id
+        self._unmerged = []
+        self._uncovered = [
+            item for item in self._uncovered if item[0] > last_id
+        ]
+
+        print(f"📝 SUMMARY (#{first_id}–#{last_id}) → {self.running_summary}")
+
+        self.output.write_summary(
+            summary=self.running_summary,
+            first_sentence_id=first_id,
+            last_sentence_id=last_id,
+        )
@@ -1,18 +1,37 @@
 import os
 import json
 import time
+from typing import Dict, Optional
+
 from dotenv import load_dotenv
 
+from app.transcript_index import TranscriptIndex
+
 load_dotenv()
 
 
 class OutputManager:
-    def __init__(self):
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        path: Optional[str] = None,
+        index_path: Optional[str] = None,
+    ):
+        """
+        path / index_path override OUTPUT_PATH / OUTPUT_INDEX_PATH
+        (index_path="" disables the index).
+        """
+        self.sample_rate = sample_rate
         self.format = os.getenv("OUTPUT_FORMAT", "FORMAT_FILE")
-        self.path = os.getenv("OUTPUT_PATH", "output/transcript.jsonl")
+        self.path = path or os.getenv("OUTPUT_PATH", "output/transcript.jsonl")
 
         print(f"[OutputManager] Initialized | format={self.format}")
 
+        # Live full-text index, updated in the same pass as each write
+        if index_path is None:
+            index_path = os.getenv("OUTPUT_INDEX_PATH", "")
+        self.index = TranscriptIndex(index_path) if index_path else None
+
         if self.format == "FORMAT_FILE":
             os.makedirs(os.path.dirname(self.path), exist_ok=True)
             self._file = open(self.path, "a", encoding="utf-8")
@@ -21,16 +40,98 @@ class OutputManager:
                 f"Output format not supported yet: {self.format}"
             )
 
-    def write_raw(self, sentence_id: int, text: str):
+    def write_raw(
+        self,
+        sentence_id: int,
+        text: str,
+        audio_span: Optional[Dict[str, int]] = None,
+        marks: Optional[Dict[str, float]] = None,
+        language: Optional[str] = None,
+    ):
         record = {
             "type": "raw",
             "sentence_id": sentence_id,
             "text": text,
             "timestamp": time.time(),
         }
+        if language:
+            record["language"] = language
+        self._add_timing(record, audio_span, marks)
+        self._write(record)
+
+        if self.index:
+            self.index.add(
+                sentence_id,
+                "raw",
+                text,
+                record["timestamp"],
+                record.get("audio"),
+            )
+
+    def write_revised(
+        self,
+        sentence_id: int,
+        text: str,
+        model: str,
+        audio_span: Optional[Dict[str, int]] = None,
+        marks: Optional[Dict[str, float]] = None,
+        language: Optional[str] = None,
+    ):
+        """
+        Background re-transcription of an already written raw sentence.
+        """
+        record = {
+            "type": "revised",
+            "sentence_id": sentence_id,
+            "text": text,
+            "model": model,
+            "timestamp": time.time(),
+        }
+        if language:
+            record["language"] = language
+        self._add_timing(record, audio_span, marks)
         self._write(record)
 
-    def write_llm(self, sentence_id: int, refined: str, translated: str):
+        if self.index:
+            self.index.add(
+                sentence_id,
+                "revised",
+                text,
+                record["timestamp"],
+                record.get("audio"),
+            )
+
+    def write_partial(
+        self,
+        sentence_id: int,
+        text: str,
+        new_words: int,
+        revision: int,
+    ):
+        """
+        Interim caption; text only grows between revisions, new_words
+        is how many trailing words were added since the last one.
+        """
+        record = {
+            "type": "partial",
+            "sentence_id": sentence_id,
+            "text": text,
+            "new_words": new_words,
+            "revision": revision,
+            "timestamp": time.time(),
+        }
+        self._write(record)
+
+    def write_llm(
+        self,
+        sentence_id: int,
+        refined: str,
+        translated: str,
+        audio_span: Optional[Dict[str, int]] = None,
+        marks: Optional[Dict[str, float]] = None,
+        language: Optional[str] = None,
+        translations: Optional[Dict[str, str]] = None,
+    ):
         record = {
             "type": "llm",
             "sentence_id": sentence_id,
@@ -38,13 +139,118 @@ class OutputManager:
             "translated": translated,
             "timestamp": time.time(),
         }
+        if translations:
+            record["translations"] = dict(translations)
+        if language:
+            record["language"] = language
+        self._add_timing(record, audio_span, marks)
+        self._write(record)
+
+        if self.index:
+            self._index_llm(record)
+
+    def _index_llm(self, record: dict):
+        sentence_id = record["sentence_id"]
+        timestamp = record["timestamp"]
+        audio = record.get("audio")
+
+        self.index.add(
+            sentence_id, "refined", record["refined_en"], timestamp, audio
+        )
+
+        translations = record.get("translations") or {}
+        if not translations and record["translated"]:
+            self.index.add(
+                sentence_id,
+                "translated",
+                record["translated"],
+                timestamp,
+                audio,
+            )
+
+        for lang, text in translations.items():
+            self.index.add(
+                sentence_id, f"translated:{lang}", text, timestamp, audio
+            )
+
+    def write_summary(
+        self,
+        summary: str,
+        first_sentence_id: int,
+        last_sentence_id: int,
+    ):
+        """
+        Running meeting summary; covers sentences up to last_sentence_id
+        (minus logged gaps from failed LLM calls). first_sentence_id
+        marks where this update's new content starts.
+        """
+        record = {
+            "type": "summary",
+            "first_sentence_id": first_sentence_id,
+            "last_sentence_id": last_sentence_id,
+            "summary": summary,
+            "timestamp": time.time(),
+        }
         self._write(record)
 
+    def _add_timing(
+        self,
+        record: dict,
+        audio_span: Optional[Dict[str, int]],
+        marks: Optional[Dict[str, float]],
+    ):
+        """
+        Attach audio-time position and per-stage wall-clock marks.
+        """
+        if audio_span:
+            start = audio_span["start_sample"]
+            end = audio_span["end_sample"]
+            record["audio"] = {
+                "start_sample": start,
+                "end_sample": end,
+                "start_sec": round(start / self.sample_rate, 3),
+                "end_sec": round(end / self.sample_rate, 3),
+            }
+
+        if marks:
+            record["marks"] = dict(marks)
+
     def _write(self, record: dict):
         if self.format == "FORMAT_FILE":
             self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
             self._file.flush()
 
+    def tell(self) -> int:
+        """
+        Current end-of-output position (for checkpointing). Also
+        persists the index, so it covers everything up to this point.
+        """
+        if self.index:
+            self.index.save()
+
+        if self.format == "FORMAT_FILE":
+            self._file.flush()
+            return self._file.tell()
+        return 0
+
+    def truncate(self, offset: int, last_sentence_id: Optional[int] = None):
+        """
+        Drop records written after a checkpoint, so a resumed run
+        regenerates them instead of duplicating sentence ids.
+        Index entries past last_sentence_id are dropped as well.
+        """
+        if self.format == "FORMAT_FILE":
+            self._file.flush()
+            self._file.truncate(offset)
+            self._file.seek(offset)
+
+        if self.index and last_sentence_id is not None:
+            self.index.remove_after(last_sentence_id)
+            self.index.save()
+
     def close(self):
         if hasattr(self, "_file"):
             self._file.close()
+
+        if self.index:
+            self.index.save()
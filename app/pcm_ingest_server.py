@@ -0,0 +1,399 @@
+# pcm_ingest_server.py
+
+import asyncio
+import inspect
+import json
+import struct
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set, Union
+
+import numpy as np
+
+from app.audio_buffer_manager import AudioBufferManager
+
+# Every frame: 4-byte big-endian payload length, then payload.
+# First frame = JSON header, then raw interleaved PCM; length 0 = end.
+_LENGTH = struct.Struct(">I")
+
+SUPPORTED_DTYPES = {"int16": np.int16, "float32": np.float32}
+
+# Header sanity bounds (AudioBufferManager sizes buffers from these)
+MAX_SAMPLE_RATE = 384000
+MAX_CHANNELS = 32
+
+
+class IngestSession:
+    """
+    One capture stream (keyed by session id) with its own audio buffer.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        sample_rate: int,
+        channels: int,
+        dtype: str,
+        buffer_manager: AudioBufferManager,
+    ):
+        self.session_id = session_id
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.dtype = np.dtype(SUPPORTED_DTYPES[dtype])
+        self.buffer_manager = buffer_manager
+
+        self.frames_received = 0
+        self.bytes_received = 0
+
+        # Interarrival jitter (RFC 3550 style), in ms
+        self.jitter_ms = 0.0
+        self.max_gap_ms = 0.0
+        self._last_arrival: Optional[float] = None
+        self._last_transit: Optional[float] = None
+        self._stream_started: Optional[float] = None
+
+        # Backpressure
+        self.queue_high_water = 0
+        self.backpressure_waits = 0
+
+        self.handler_errors = 0
+
+    def record_arrival(self, frames: int, nbytes: int) -> None:
+        now = time.monotonic()
+
+        if self._stream_started is None:
+            self._stream_started = now
+
+        # Transit = arrival time relative to the audio time it carries
+        media_time = self.frames_received / self.sample_rate
+        transit = (now - self._stream_started) - media_time
+
+        if self._last_transit is not None:
+            d = abs(transit - self._last_transit) * 1000
+            self.jitter_ms += (d - self.jitter_ms) / 16
+
+        if self._last_arrival is not None:
+            self.max_gap_ms = max(
+                self.max_gap_ms, (now - self._last_arrival) * 1000
+            )
+
+        self._last_transit = transit
+        self._last_arrival = now
+        self.frames_received += frames
+        self.bytes_received += nbytes
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "frames": self.frames_received,
+            "bytes": self.bytes_received,
+            "audio_sec": round(self.frames_received / self.sample_rate, 3),
+            "jitter_ms": round(self.jitter_ms, 3),
+            "max_gap_ms": round(self.max_gap_ms, 3),
+            "queue_high_water": self.queue_high_water,
+            "backpressure_waits": self.backpressure_waits,
+            "handler_errors": self.handler_errors,
+        }
+
+
+WindowsHandler = Callable[
+    [IngestSession, list], Union[None, Awaitable[None]]
+]
+
+
+class PCMIngestServer:
+    """
+    Asyncio TCP server accepting framed PCM from capture agents.
+
+    Payloads are viewed with np.frombuffer (no copy) and handed straight
+    to the session's AudioBufferManager. Each connection has a bounded
+    frame queue; when it is full the reader stops reading the socket,
+    so TCP flow control pushes back on the client.
+    """
+
+    def __init__(
+        self,
+        on_windows: WindowsHandler,
+        host: str = "127.0.0.1",
+        port: int = 9000,
+        target_sample_rate: int = 16000,
+        window_size_sec: float = 2.0,
+        step_size_sec: float = 1.0,
+        max_queued_frames: int = 64,
+        max_frame_bytes: int = 1 << 20,
+    ):
+        self.on_windows = on_windows
+        self.host = host
+        self.port = port
+        self.target_sample_rate = target_sample_rate
+        self.window_size_sec = window_size_sec
+        self.step_size_sec = step_size_sec
+        self.max_queued_frames = max_queued_frames
+        self.max_frame_bytes = max_frame_bytes
+
+        self.sessions: Dict[str, IngestSession] = {}
+        # Session ids with a live connection (one socket per stream)
+        self._connected: Set[str] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # -------------------------------------------------
+    # LIFECYCLE
+    # -------------------------------------------------
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        # port=0 → pick a free port
+        self.port = self._server.sockets[0].getsockname()[1]
+
+        print(
+            f"[PCMIngestServer] Listening on {self.host}:{self.port} | "
+            f"target_sr={self.target_sample_rate}, "
+            f"max_queued_frames={self.max_queued_frames}"
+        )
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # -------------------------------------------------
+    # CONNECTION
+    # -------------------------------------------------
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        try:
+            header = json.loads(await self._read_frame(reader))
+            session = self._open_session(header)
+        except (ValueError, KeyError, asyncio.IncompleteReadError) as e:
+            print(f"[PCMIngestServer] Rejected connection: {e!r}")
+            writer.close()
+            return
+
+        print(
+            f"[PCMIngestServer] Session {session.session_id} connected | "
+            f"sr={session.sample_rate}, channels={session.channels}, "
+            f"dtype={session.dtype}"
+        )
+
+        frames: asyncio.Queue = asyncio.Queue(maxsize=self.max_queued_frames)
+        consumer = asyncio.create_task(self._consume(session, frames))
+        frame_bytes = session.dtype.itemsize * session.channels
+
+        try:
+            while True:
+                payload = await self._read_frame(reader)
+                if not payload:
+                    break
+
+                # Jitter is measured at socket arrival, before queueing
+                session.record_arrival(
+                    len(payload) // frame_bytes, len(payload)
+                )
+
+                if frames.full():
+                    session.backpressure_waits += 1
+                if not await self._enqueue(frames, payload, consumer):
+                    break
+
+                session.queue_high_water = max(
+                    session.queue_high_water, frames.qsize()
+                )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            print(f"[PCMIngestServer] Dropping {session.session_id}: {e}")
+        finally:
+            # End marker; never block on a consumer that is gone
+            if not await self._enqueue(frames, None, consumer):
+                consumer.cancel()
+            try:
+                await consumer
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                print(
+                    f"[PCMIngestServer] Consumer for {session.session_id} "
+                    f"died: {e!r}"
+                )
+            writer.close()
+            self._connected.discard(session.session_id)
+
+            print(
+                f"[PCMIngestServer] Session {session.session_id} "
+                f"disconnected | {session.stats()}"
+            )
+
+    async def _enqueue(
+        self,
+        frames: asyncio.Queue,
+        item: Optional[bytes],
+        consumer: asyncio.Task,
+    ) -> bool:
+        """
+        Put into the frame queue unless the consumer task has ended.
+        Returns False if the item could not be queued.
+        """
+        if consumer.done():
+            return False
+
+        try:
+            frames.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        put = asyncio.ensure_future(frames.put(item))
+        await asyncio.wait(
+            {put, consumer}, return_when=asyncio.FIRST_COMPLETED
+        )
+        if put.done():
+            return True
+
+        put.cancel()
+        return False
+
+    async def _read_frame(self, reader: asyncio.StreamReader) -> bytes:
+        (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+
+        if length > self.max_frame_bytes:
+            raise ValueError(f"Frame too large: {length} bytes")
+
+        return await reader.readexactly(length) if length else b""
+
+    def _open_session(self, header: dict) -> IngestSession:
+        if not isinstance(header, dict):
+            raise ValueError("Header must be a JSON object")
+
+        try:
+            session_id = str(header["session"])
+            sample_rate = int(header["sample_rate"])
+            channels = int(header.get("channels", 1))
+        except (TypeError, OverflowError) as e:
+            raise ValueError(f"Malformed header: {e}")
+        dtype = str(header.get("dtype", "int16"))
+
+        if not 0 < sample_rate <= MAX_SAMPLE_RATE:
+            raise ValueError(f"Invalid sample_rate: {sample_rate}")
+        if not 0 < channels <= MAX_CHANNELS:
+            raise ValueError(f"Invalid channels: {channels}")
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype}")
+
+        # Two sockets must never interleave frames into one buffer
+        if session_id in self._connected:
+            raise ValueError(f"Session already connected: {session_id}")
+
+        # A reconnect with the same id continues the same stream
+        session = self.sessions.get(session_id)
+        if session and (
+            session.sample_rate == sample_rate
+            and session.channels == channels
+            and session.dtype == np.dtype(SUPPORTED_DTYPES[dtype])
+        ):
+            self._connected.add(session_id)
+            return session
+
+        session = IngestSession(
+            session_id=session_id,
+            sample_rate=sample_rate,
+            channels=channels,
+            dtype=dtype,
+            buffer_manager=AudioBufferManager(
+                input_sample_rate=sample_rate,
+                target_sample_rate=self.target_sample_rate,
+                window_size_sec=self.window_size_sec,
+                step_size_sec=self.step_size_sec,
+            ),
+        )
+        self.sessions[session_id] = session
+        self._connected.add(session_id)
+        return session
+
+    async def _consume(
+        self,
+        session: IngestSession,
+        frames: asyncio.Queue,
+    ) -> None:
+        frame_bytes = session.dtype.itemsize * session.channels
+
+        while True:
+            payload = await frames.get()
+            if payload is None:
+                break
+
+            usable = len(payload) - len(payload) % frame_bytes
+
+            # View over the received bytes: no intermediate copy
+            pcm = np.frombuffer(
+                memoryview(payload)[:usable], dtype=session.dtype
+            ).reshape(-1, session.channels)
+
+            try:
+                windows = session.buffer_manager.add_chunk_timed(pcm)
+                if not windows:
+                    continue
+
+                result = self.on_windows(session, windows)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                # Drop this batch, keep the session (and the reader) alive
+                session.handler_errors += 1
+                print(
+                    f"[PCMIngestServer] Handler failed for "
+                    f"{session.session_id}: {e!r}"
+                )
+
+
+async def send_pcm(
+    host: str,
+    port: int,
+    session_id: str,
+    pcm: np.ndarray,
+    sample_rate: int,
+    frame_size: int = 1024,
+    realtime: bool = False,
+) -> None:
+    """
+    Local test client: stream a (frames, channels) int16/float32 array
+    to a PCMIngestServer.
+    """
+    if pcm.ndim == 1:
+        pcm = pcm[:, None]
+
+    pcm = np.ascontiguousarray(pcm)
+    dtype = str(pcm.dtype)
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+
+    reader, writer = await asyncio.open_connection(host, port)
+
+    header = json.dumps(
+        {
+            "session": session_id,
+            "sample_rate": sample_rate,
+            "channels": pcm.shape[1],
+            "dtype": dtype,
+        }
+    ).encode("utf-8")
+    writer.write(_LENGTH.pack(len(header)) + header)
+
+    for idx in range(0, len(pcm), frame_size):
+        payload = memoryview(pcm[idx : idx + frame_size]).cast("B")
+        writer.write(_LENGTH.pack(len(payload)))
+        writer.write(payload)
+        await writer.drain()
+
+        if realtime:
+            await asyncio.sleep(frame_size / sample_rate)
+
+    writer.write(_LENGTH.pack(0))
+    await writer.drain()
+
+    writer.close()
+    await writer.wait_closed()
@@ -1,7 +1,7 @@
 # sentence_builder.py
 
 import re
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 
 class SentenceBuilder:
@@ -27,6 +27,18 @@ class SentenceBuilder:
         self._buffer: List[str] = []
         self._last_final_sentence: Optional[str] = None
 
+        # Audio-time span (start_sample, end_sample) per buffered word
+        self._word_spans: List[Optional[Tuple[int, int]]] = []
+        self.last_final_span: Optional[Dict[str, int]] = None
+
+        # Capture time of the window each buffered word first appeared in
+        self._word_captured: List[Optional[float]] = []
+        self.last_final_captured_at: Optional[float] = None
+
+        # Interim (partial) hypothesis state
+        self._partial_words: List[str] = []
+        self._partial_revision = 0
+
         print(
             f"[SentenceBuilder] Initialized | "
             f"min_words={self.min_words}, "
@@ -40,28 +52,117 @@ class SentenceBuilder:
 
     def add_segments(
         self,
-        segments: List[str],
+        segments: List[Union[str, Dict]],
         silence_ms: int,
+        captured_at: Optional[float] = None,
     ) -> Optional[str]:
         """
         Add new STT text segments and possibly produce a FINAL sentence.
+
+        Segments may be plain strings or timed dicts from
+        STTEngine.transcribe_timed. For timed input, the audio span of
+        the finalized sentence is exposed as last_final_span; words
+        whose audio is already in a finalized sentence (window overlap)
+        are dropped, so consecutive spans never overlap.
+
+        captured_at: capture time of the window the segments came from.
+        last_final_captured_at is that of the window holding the
+        sentence's last word (not the one that finalized it).
         """
         for segment in segments:
+            timed = segment if isinstance(segment, dict) else None
+            if timed:
+                segment = timed["text"]
+
             cleaned = self._clean(segment)
             if not cleaned:
                 continue
 
-            words = self._dedup_and_split_words(cleaned)
+            tokens = cleaned.split()
+            spans = (
+                self._token_spans(timed, len(tokens))
+                if timed
+                else [None] * len(tokens)
+            )
+            tokens, spans = self._drop_finalized(tokens, spans)
+
+            words = self._dedup_and_split_words(" ".join(tokens))
             if not words:
                 continue
 
+            # Words dropped by dedup are a prefix; drop their spans too
+            spans = spans[len(tokens) - len(words):]
+
             self._buffer.extend(words)
+            self._word_spans.extend(spans)
+            self._word_captured.extend([captured_at] * len(words))
 
         if self._should_finalize(silence_ms):
             return self._finalize()
 
         return None
 
+    def get_partial(self) -> Optional[Dict[str, object]]:
+        """
+        Return the current UNFINALIZED hypothesis, if it changed since
+        the last call.
+
+        The buffer is append-only (overlap is deduplicated before words
+        are buffered), so words already shown never change; a partial
+        only ever grows until the sentence is finalized.
+
+        Returns:
+        {
+            "text": "...",
+            "new_words": int,      # trailing words added since last revision
+            "revision": int        # monotonically increasing
+        }
+        """
+        words = list(self._buffer)
+
+        if not words or words == self._partial_words:
+            return None
+
+        new_words = len(words) - len(self._partial_words)
+
+        self._partial_words = words
+        self._partial_revision += 1
+
+        return {
+            "text": " ".join(words),
+            "new_words": new_words,
+            "revision": self._partial_revision,
+        }
+
+    def state_dict(self) -> Dict[str, object]:
+        """
+        Open sentence buffer and partial state, for checkpointing.
+        """
+        return {
+            "buffer": list(self._buffer),
+            "word_spans": [list(s) if s else None for s in self._word_spans],
+            "last_final_sentence": self._last_final_sentence,
+            "last_final_span": self.last_final_span,
+            "word_captured": list(self._word_captured),
+            "last_final_captured_at": self.last_final_captured_at,
+            "partial_words": list(self._partial_words),
+            "partial_revision": self._partial_revision,
+        }
+
+    def load_state(self, state: Dict[str, object]) -> None:
+        self._buffer = list(state["buffer"])
+        self._word_spans = [
+            tuple(s) if s else None for s in state["word_spans"]
+        ]
+        self._last_final_sentence = state["last_final_sentence"]
+        self.last_final_span = state["last_final_span"]
+        self._word_captured = list(
+            state.get("word_captured", [None] * len(self._buffer))
+        )
+        self.last_final_captured_at = state.get("last_final_captured_at")
+        self._partial_words = list(state["partial_words"])
+        self._partial_revision = state["partial_revision"]
+
     # -------------------------------------------------
     # FINALIZATION LOGIC
     # -------------------------------------------------
@@ -97,18 +198,102 @@ class SentenceBuilder:
         return False
 
     def _finalize(self) -> Optional[str]:
+        self._partial_words = []
+
         if len(self._buffer) < self.min_words:
             self._buffer.clear()
+            self._word_spans.clear()
+            self._word_captured.clear()
             return None
 
         sentence = " ".join(self._buffer)
         sentence = self._normalize(sentence)
 
         self._last_final_sentence = sentence
+        self.last_final_span = self._buffer_span()
+        self.last_final_captured_at = self._end_captured_at()
         self._buffer.clear()
+        self._word_spans.clear()
+        self._word_captured.clear()
 
         return sentence
 
+    def _buffer_span(self) -> Optional[Dict[str, int]]:
+        spans = [s for s in self._word_spans if s is not None]
+        if not spans:
+            return None
+
+        start = spans[0][0]
+        end = max(end for _, end in spans)
+
+        # Never reach back into the previous sentence's audio
+        if self.last_final_span:
+            start = min(max(start, self.last_final_span["end_sample"]), end)
+
+        return {"start_sample": start, "end_sample": end}
+
+    def _token_spans(
+        self,
+        segment: Dict,
+        count: int,
+    ) -> List[Optional[Tuple[int, int]]]:
+        """
+        One audio span per whitespace token of the segment text, from
+        its word timestamps (the segment span when they do not line up).
+        """
+        spans: List[Optional[Tuple[int, int]]] = []
+        for w in segment.get("words") or []:
+            for _ in w["word"].split():
+                spans.append((w["start_sample"], w["end_sample"]))
+
+        if len(spans) != count:
+            span = (segment["start_sample"], segment["end_sample"])
+            spans = [span] * count
+
+        return spans
+
+    def _drop_finalized(
+        self,
+        tokens: List[str],
+        spans: List[Optional[Tuple[int, int]]],
+    ) -> Tuple[List[str], List[Optional[Tuple[int, int]]]]:
+        """
+        Drop leading tokens whose audio (mostly) belongs to the last
+        finalized sentence: the window overlap re-decodes it.
+        """
+        if not self.last_final_span:
+            return tokens, spans
+
+        finalized_end = self.last_final_span["end_sample"]
+
+        k = 0
+        while (
+            k < len(spans)
+            and spans[k] is not None
+            and (spans[k][0] + spans[k][1]) // 2 < finalized_end
+        ):
+            k += 1
+
+        return tokens[k:], spans[k:]
+
+    def _end_captured_at(self) -> Optional[float]:
+        """
+        Capture time of the word ending last in audio time (falls back
+        to the last buffered word for untimed input).
+        """
+        timed = [
+            (span[1], captured)
+            for span, captured in zip(self._word_spans, self._word_captured)
+            if span is not None and captured is not None
+        ]
+        if timed:
+            # Earliest window that contains the sentence end
+            end = max(e for e, _ in timed)
+            return min(c for e, c in timed if e == end)
+
+        captured = [c for c in self._word_captured if c is not None]
+        return captured[-1] if captured else None
+
     # -------------------------------------------------
     # WORD-LEVEL DEDUP
     # -------------------------------------------------
@@ -0,0 +1,213 @@
+# sentence_enricher.py
+
+import asyncio
+import time
+from typing import Callable, Dict, Optional
+
+from app.llm_client import LLMClient
+from app.llm_commit_queue import OrderedCommitQueue
+from app.output_manager import OutputManager
+
+# (sentence_id, result | None when skipped, sentence meta with marks)
+CommitHook = Callable[[int, Optional[Dict[str, object]], dict], None]
+
+
+class SentenceEnricher:
+    """
+    Async LLM enrichment with order-guaranteed commit.
+
+    Each finalized sentence is refined / translated in its own task
+    (after a bounded wait for its background STT revision, if any).
+    Results are written through OutputManager strictly in sentence
+    order; failed calls are skipped so they never stall later ones.
+    """
+
+    def __init__(
+        self,
+        llm: LLMClient,
+        output: OutputManager,
+        summarizer=None,
+        revision_timeout_sec: float = 5.0,
+        on_commit: Optional[CommitHook] = None,
+        verbose: bool = True,
+    ):
+        self.llm = llm
+        self.output = output
+        self.summarizer = summarizer
+        self.revision_timeout_sec = revision_timeout_sec
+        self.on_commit = on_commit
+        self.verbose = verbose
+
+        self.commit_queue = OrderedCommitQueue()
+
+        # Text, language, audio span + per-stage wall-clock marks,
+        # kept until LLM commit
+        self.sentence_meta: Dict[int, dict] = {}
+
+        # Background re-transcriptions, resolved on the event loop
+        self._revisions: Dict[int, asyncio.Future] = {}
+
+        self.pending_tasks: set[asyncio.Task] = set()
+
+    # -------------------------------------------------
+    # PUBLIC API
+    # -------------------------------------------------
+
+    def add_sentence(
+        self,
+        sentence_id: int,
+        text: str,
+        audio_span: Optional[Dict[str, int]] = None,
+        marks: Optional[Dict[str, float]] = None,
+        language: Optional[str] = None,
+        expect_revision: bool = False,
+    ) -> None:
+        """
+        Schedule enrichment of a finalized (already written) raw sentence.
+        With expect_revision, the LLM waits for on_revised first.
+        """
+        self.sentence_meta[sentence_id] = {
+            "text": text,
+            "audio_span": audio_span,
+            "marks": dict(marks or {}),
+            "language": language,
+        }
+
+        if expect_revision:
+            self._revisions[sentence_id] = (
+                asyncio.get_running_loop().create_future()
+            )
+
+        self._schedule(sentence_id)
+
+    def on_revised(
+        self,
+        sentence_id: int,
+        result: Optional[Dict[str, object]],
+    ) -> None:
+        """
+        Background revision result (call on the event loop thread).
+        """
+        # Written here (before the waiting LLM task resumes), so an
+        # in-time revised record always precedes its llm record
+        if result:
+            meta = self.sentence_meta.get(sentence_id)
+            if meta:
+                meta["text"] = result["text"]
+                meta["marks"]["revised"] = result["revised_at"]
+
+            if self.verbose:
+                print(f"🔁 REVISED #{sentence_id} → {result['text']}")
+
+            self.output.write_revised(
+                sentence_id,
+                result["text"],
+                model=result["model"],
+                audio_span=meta["audio_span"] if meta else None,
+                language=result["language"],
+            )
+
+        revision = self._revisions.get(sentence_id)
+        if revision and not revision.done():
+            revision.set_result(result)
+
+    async def wait(self, timeout: Optional[float] = None) -> None:
+        if self.pending_tasks:
+            await asyncio.wait(self.pending_tasks, timeout=timeout)
+
+    def state_dict(self) -> dict:
+        return {
+            "uncommitted": self.sentence_meta,
+            "commit_queue": self.commit_queue.state_dict(),
+        }
+
+    def load_state(self, state: dict) -> int:
+        """
+        Restore and re-issue only LLM work whose result never arrived.
+        Returns the number of re-issued sentences.
+        """
+        self.commit_queue.load_state(state["commit_queue"])
+        self.sentence_meta.update(
+            {int(k): v for k, v in state["uncommitted"].items()}
+        )
+
+        reissued = 0
+        for sid in sorted(self.sentence_meta):
+            if sid not in self.commit_queue.pending:
+                self._schedule(sid)
+                reissued += 1
+
+        return reissued
+
+    # -------------------------------------------------
+    # INTERNAL
+    # -------------------------------------------------
+
+    def _schedule(self, sentence_id: int) -> None:
+        task = asyncio.create_task(self._process(sentence_id))
+        self.pending_tasks.add(task)
+        task.add_done_callback(self.pending_tasks.discard)
+
+    async def _process(self, sentence_id: int) -> None:
+        # Two-tier: enrich the revised text if it arrives in time
+        revision = self._revisions.get(sentence_id)
+        if revision:
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(revision),
+                    timeout=self.revision_timeout_sec,
+                )
+            except asyncio.TimeoutError:
+                print(f"⚠️ REVISION LATE #{sentence_id} → using draft")
+            self._revisions.pop(sentence_id, None)
+
+        meta = self.sentence_meta[sentence_id]
+        meta["marks"]["llm_requested"] = time.time()
+
+        result = await self.llm.refine_and_translate(
+            meta["text"],
+            source_lang=meta["language"],
+        )
+        meta["marks"]["llm_done"] = time.time()
+
+        if result:
+            self.commit_queue.add_result(sentence_id, result)
+        else:
+            self.commit_queue.skip(sentence_id)
+
+        self._commit_ready()
+
+    def _commit_ready(self) -> None:
+        while True:
+            ready = self.commit_queue.pop_ready()
+            if not ready:
+                break
+
+            ready_id, ready_result = ready
+            timing = self.sentence_meta.pop(ready_id)
+
+            if ready_result is None:
+                print(f"⚠️ LLM SKIPPED #{ready_id}")
+            else:
+                timing["marks"]["llm_committed"] = time.time()
+
+                if self.verbose:
+                    print(f"🧠 LLM OUTPUT #{ready_id} → {ready_result}")
+
+                self.output.write_llm(
+                    sentence_id=ready_id,
+                    refined=ready_result["refined_en"],
+                    translated=ready_result["translated"],
+                    audio_span=timing["audio_span"],
+                    marks=timing["marks"],
+                    language=timing["language"],
+                    translations=ready_result.get("translations"),
+                )
+
+                if self.summarizer:
+                    self.summarizer.add_sentence(
+                        ready_id, ready_result["refined_en"]
+                    )
+
+            if self.on_commit:
+                self.on_commit(ready_id, ready_result, timing)
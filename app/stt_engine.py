@@ -1,13 +1,16 @@
 # stt_engine.py
 
-from typing import List
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 from faster_whisper import WhisperModel
 
 
 class STTEngine:
     """
-    Stateless Speech-to-Text engine wrapper.
+    Speech-to-Text engine wrapper.
+
+    Stateless for a fixed language. With language="auto", the detected
+    language is cached per speech turn (see reset_language).
     """
 
     def __init__(
@@ -16,20 +19,46 @@ class STTEngine:
         device: str = "cpu",
         compute_type: str = "int8",
         language: str = "en",
+        sample_rate: int = 16000,
+        cpu_threads: int = 0,
+        language_confidence: float = 0.7,
+        min_avg_logprob: float = -1.0,
+        beam_size: int = 5,
     ):
         self.language = language
+        self.beam_size = beam_size  # 1 = greedy (draft / low latency)
+        self.sample_rate = sample_rate
+
+        # Auto-language cache
+        self.language_confidence = language_confidence
+        self.min_avg_logprob = min_avg_logprob
+        self._cached_language: Optional[str] = None
+        self.last_language: Optional[str] = (
+            None if language == "auto" else language
+        )
+        # Confidence of the last call (for callers that own the cache)
+        self.last_language_probability: Optional[float] = None
+        self.last_avg_logprob: Optional[float] = None
 
         self.model = WhisperModel(
             model_size,
             device=device,
             compute_type=compute_type,
+            cpu_threads=cpu_threads,
         )
 
         print(
             f"[STTEngine] Loaded model={model_size}, "
-            f"device={device}, compute_type={compute_type}"
+            f"device={device}, compute_type={compute_type}, "
+            f"language={language}, beam_size={beam_size}"
         )
 
+    def reset_language(self) -> None:
+        """
+        Drop the cached language (call on a speech-turn / silence boundary).
+        """
+        self._cached_language = None
+
     def transcribe(self, audio: np.ndarray) -> List[str]:
         """
         Transcribe a mono 16kHz audio window.
@@ -37,21 +66,127 @@ class STTEngine:
         Returns:
             List of text segments.
         """
+        return [s["text"] for s in self.transcribe_timed(audio)]
+
+    def transcribe_timed(
+        self,
+        audio: np.ndarray,
+        start_sample: int = 0,
+        language: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Transcribe a mono 16kHz audio window starting at absolute
+        position start_sample.
+
+        language: decode in this language for this call only, without
+        touching the auto-language cache (STTWorkerPool decides the
+        language per speech turn and passes it here).
+
+        Returns:
+            List of segments:
+            {
+                "text": "...",
+                "start_sample": int,
+                "end_sample": int,
+                "language": "en",
+                "words": [{"word", "start_sample", "end_sample"}, ...]
+            }
+        """
         if audio.ndim != 1:
             raise ValueError("Audio must be mono (1D numpy array)")
 
-        segments, _ = self.model.transcribe(
+        forced = language is not None
+        auto = self.language == "auto" and not forced
+        if not forced:
+            language = self._cached_language if auto else self.language
+
+        # language=None → Whisper detects (only when nothing is cached)
+        segments, info = self.model.transcribe(
             audio,
-            language=self.language,
+            language=language,
             vad_filter=True,
-            beam_size=5,
+            beam_size=self.beam_size,
+            # Per-word spans, so overlap dedup can drop a word's audio too
+            word_timestamps=True,
         )
+        segments = list(segments)
 
-        texts: List[str] = []
+        self.last_language_probability = info.language_probability
+        self.last_avg_logprob = (
+            sum(s.avg_logprob for s in segments) / len(segments)
+            if segments
+            else None
+        )
+
+        if auto:
+            self._update_language_cache(language, info)
+        elif forced:
+            self.last_language = language
+
+        results: List[Dict] = []
+        window_end = start_sample + len(audio)
 
         for segment in segments:
             text = segment.text.strip()
             if text:
-                texts.append(text)
+                start, end = self._to_samples(
+                    segment.start, segment.end, start_sample, window_end
+                )
+                words = []
+                for w in segment.words or []:
+                    w_start, w_end = self._to_samples(
+                        w.start, w.end, start_sample, window_end
+                    )
+                    words.append(
+                        {
+                            "word": w.word.strip(),
+                            "start_sample": w_start,
+                            "end_sample": w_end,
+                        }
+                    )
+
+                results.append(
+                    {
+                        "text": text,
+                        "start_sample": start,
+                        "end_sample": end,
+                        "language": self.last_language,
+                        "words": words,
+                    }
+                )
+
+        return results
+
+    def _to_samples(
+        self,
+        start_sec: float,
+        end_sec: float,
+        offset: int,
+        window_end: int,
+    ) -> Tuple[int, int]:
+        return (
+            offset + int(start_sec * self.sample_rate),
+            min(window_end, offset + int(end_sec * self.sample_rate)),
+        )
+
+    def _update_language_cache(
+        self,
+        used_language: Optional[str],
+        info,
+    ) -> None:
+        """
+        Cache a confident detection; drop the cache when decoding with
+        the cached language becomes unconfident.
+        """
+        self.last_language = info.language
+
+        if used_language is None:
+            if info.language_probability >= self.language_confidence:
+                self._cached_language = info.language
+            return
 
-        return texts
+        if (
+            self.last_avg_logprob is not None
+            and self.last_avg_logprob < self.min_avg_logprob
+        ):
+            self._cached_language = None
@@ -0,0 +1,262 @@
+# stt_pool.py
+
+import multiprocessing as mp
+import os
+import queue
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.llm_commit_queue import OrderedCommitQueue
+from app.stt_engine import STTEngine
+
+# One engine per worker process
+_worker_engine: Optional[STTEngine] = None
+
+
+def _init_worker(engine_kwargs: dict, core_sets: mp.Queue) -> None:
+    """
+    Pin the worker to its core subset and load its own model.
+    """
+    global _worker_engine
+
+    try:
+        cores = core_sets.get_nowait()
+    except queue.Empty:
+        cores = None
+
+    if cores and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError as e:
+            # A failing initializer would break the whole pool
+            print(f"[STTWorkerPool] Core pinning failed, unpinned: {e!r}")
+
+    _worker_engine = STTEngine(**engine_kwargs)
+
+
+def _transcribe_job(
+    audio: np.ndarray,
+    start_sample: int,
+    language: Optional[str],
+) -> dict:
+    """
+    language=None → detect on this window. Workers keep no language
+    state; the coordinator decides per speech turn.
+    """
+    _worker_engine.reset_language()
+
+    segments = _worker_engine.transcribe_timed(
+        audio, start_sample, language=language
+    )
+    return {
+        "segments": segments,
+        "stt_done": time.time(),
+        "language": _worker_engine.last_language,
+        "language_probability": _worker_engine.last_language_probability,
+        "avg_logprob": _worker_engine.last_avg_logprob,
+    }
+
+
+class STTWorkerPool:
+    """
+    Decodes audio windows in parallel across STT worker processes.
+    Results are handed back strictly in window (submission) order.
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        model_size: str = "small",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        language: str = "en",
+        cores_per_worker: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        language_confidence: float = 0.7,
+        min_avg_logprob: float = -1.0,
+    ):
+        # CPUs this process may actually run on (a container's cpuset can
+        # be a subset of the host's os.cpu_count())
+        if hasattr(os, "sched_getaffinity"):
+            cpus = sorted(os.sched_getaffinity(0))
+        else:
+            cpus = list(range(os.cpu_count() or 1))
+        cpu_count = len(cpus)
+
+        self.num_workers = num_workers
+        self.cores_per_worker = cores_per_worker or max(
+            1, cpu_count // num_workers
+        )
+        self.max_in_flight = max_in_flight or num_workers * 2
+
+        # Disjoint core subsets, handed out as workers start
+        self._core_sets: mp.Queue = mp.Queue()
+        for i in range(num_workers):
+            first = i * self.cores_per_worker
+            self._core_sets.put(
+                {
+                    cpus[(first + c) % cpu_count]
+                    for c in range(self.cores_per_worker)
+                }
+            )
+
+        engine_kwargs = {
+            "model_size": model_size,
+            "device": device,
+            "compute_type": compute_type,
+            "language": language,
+            "cpu_threads": self.cores_per_worker,
+        }
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_worker,
+            initargs=(engine_kwargs, self._core_sets),
+        )
+
+        self._next_window_id = 1
+        self._in_flight: Dict[int, Future] = {}
+        self._meta: Dict[int, dict] = {}
+        self._order = OrderedCommitQueue()
+
+        # Auto-language: one decision per speech turn, made here (same
+        # policy as STTEngine's cache) and passed to every job
+        self.language = language
+        self.language_confidence = language_confidence
+        self.min_avg_logprob = min_avg_logprob
+        self._turn = 0
+        self._turn_language: Optional[str] = None
+        self._detect_window_id: Optional[int] = None
+        self._job_turn: Dict[int, tuple] = {}  # window_id → (turn, detect)
+
+        print(
+            f"[STTWorkerPool] Initialized | "
+            f"workers={self.num_workers}, "
+            f"cores_per_worker={self.cores_per_worker}, "
+            f"max_in_flight={self.max_in_flight}"
+        )
+
+    # -------------------------------------------------
+    # PUBLIC API
+    # -------------------------------------------------
+
+    def submit(self, window: dict, speech_turn: int = 0, **context) -> None:
+        """
+        Queue a window from AudioBufferManager.add_chunk_timed.
+
+        speech_turn should change on every silence boundary. In
+        auto-language mode the first window of a turn detects the
+        language and later windows of the turn wait for it, then decode
+        with that language. Extra keyword context
+        (e.g. silence_ms) is returned unchanged with the window's result.
+        Blocks while max_in_flight windows are still being decoded.
+        """
+        while len(self._in_flight) >= self.max_in_flight:
+            oldest = min(self._in_flight)
+            self._in_flight[oldest].result()
+            self._collect_done()
+
+        if speech_turn != self._turn:
+            self._turn = speech_turn
+            self._turn_language = None
+            self._detect_window_id = None
+
+        window_id = self._next_window_id
+        self._next_window_id += 1
+
+        meta = {k: v for k, v in window.items() if k != "audio"}
+        meta.update(context)
+        self._meta[window_id] = meta
+
+        language = self._job_language(window_id)
+        self._job_turn[window_id] = (self._turn, language is None)
+
+        self._in_flight[window_id] = self._executor.submit(
+            _transcribe_job,
+            window["audio"],
+            window["start_sample"],
+            language,
+        )
+
+    def pop_ready(self) -> List[dict]:
+        """
+        Return finished results that are next in window order.
+
+        Each result:
+        {
+            "window": {...},      # window metadata + submit context
+            "segments": [...],    # STTEngine.transcribe_timed output
+            "stt_done": float
+        }
+        """
+        self._collect_done()
+
+        ready: List[dict] = []
+        while True:
+            item = self._order.pop_ready()
+            if not item:
+                break
+            ready.append(item[1])
+
+        return ready
+
+    def drain(self) -> List[dict]:
+        """
+        Wait for every in-flight window and return remaining results in order.
+        """
+        for future in list(self._in_flight.values()):
+            future.result()
+
+        return self.pop_ready()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    # -------------------------------------------------
+    # INTERNAL
+    # -------------------------------------------------
+
+    def _job_language(self, window_id: int) -> Optional[str]:
+        """
+        Language to decode window_id with; None = this window detects.
+        """
+        if self.language != "auto":
+            return self.language
+
+        # Turn's detection still running → wait instead of detecting twice
+        detecting = self._in_flight.get(self._detect_window_id)
+        if self._turn_language is None and detecting is not None:
+            detecting.result()
+            self._collect_done()
+
+        if self._turn_language is None:
+            self._detect_window_id = window_id
+
+        return self._turn_language
+
+    def _update_turn_language(self, window_id: int, result: dict) -> None:
+        turn, detect = self._job_turn.pop(window_id)
+        if turn != self._turn or self.language != "auto":
+            return
+
+        if detect:
+            probability = result["language_probability"] or 0.0
+            if probability >= self.language_confidence:
+                self._turn_language = result["language"]
+            return
+
+        # Unconfident decoding with the turn's language → re-detect
+        avg_logprob = result["avg_logprob"]
+        if avg_logprob is not None and avg_logprob < self.min_avg_logprob:
+            self._turn_language = None
+            self._detect_window_id = None
+
+    def _collect_done(self) -> None:
+        for window_id in [i for i, f in self._in_flight.items() if f.done()]:
+            result = self._in_flight.pop(window_id).result()
+            self._update_turn_language(window_id, result)
+            result["window"] = self._meta.pop(window_id)
+            self._order.add_result(window_id, result)
@@ -0,0 +1,259 @@
+# stt_revision_worker.py
+
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from app.stt_engine import STTEngine
+
+# (sentence_id, {"text", "language", "model", "revised_at"} | None)
+RevisionHandler = Callable[[int, Optional[Dict[str, object]]], None]
+
+
+class PriorityGate:
+    """
+    Lets the live STT tier pre-empt background work.
+
+    The live tier wraps each decode in `with gate.live():`. Background
+    jobs only start once the live tier has been idle for min_idle_sec.
+    """
+
+    def __init__(self, min_idle_sec: float = 0.1):
+        self.min_idle_sec = min_idle_sec
+
+        self._cond = threading.Condition()
+        self._live = 0
+        self._last_live_end = 0.0
+
+    @contextmanager
+    def live(self):
+        with self._cond:
+            self._live += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._live -= 1
+                self._last_live_end = time.monotonic()
+                self._cond.notify_all()
+
+    def wait_idle(self) -> None:
+        with self._cond:
+            while True:
+                if self._live == 0:
+                    remaining = self.min_idle_sec - (
+                        time.monotonic() - self._last_live_end
+                    )
+                    if remaining <= 0:
+                        return
+                    self._cond.wait(remaining)
+                else:
+                    self._cond.wait()
+
+
+class STTRevisionWorker:
+    """
+    Background tier of two-tier STT: re-transcribes each finalized
+    sentence's audio span with a larger model.
+
+    Runs in one thread at the lowest OS scheduling priority with a small
+    thread budget, and waits on a PriorityGate so it only decodes while
+    the live tier is idle.
+    """
+
+    def __init__(
+        self,
+        on_revised: RevisionHandler,
+        gate: PriorityGate,
+        model_size: str = "medium",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        language: str = "en",
+        cpu_threads: int = 1,
+        max_queue: int = 32,
+    ):
+        self.on_revised = on_revised
+        self.gate = gate
+        self.model_size = model_size
+
+        self._engine_kwargs = {
+            "model_size": model_size,
+            "device": device,
+            "compute_type": compute_type,
+            "language": language,
+            "cpu_threads": cpu_threads,
+        }
+
+        self._jobs: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._loaded = threading.Event()
+
+        # End of the last submitted span; spans must not overlap, or the
+        # revision would repeat the end of the previous sentence
+        self._last_end_sample = 0
+
+        self.dropped = 0
+        self.load_error: Optional[str] = None
+
+        print(
+            f"[STTRevisionWorker] Initialized | model={model_size}, "
+            f"cpu_threads={cpu_threads}, max_queue={max_queue}"
+        )
+
+    # -------------------------------------------------
+    # PUBLIC API
+    # -------------------------------------------------
+
+    def start(self) -> bool:
+        """
+        Start the thread and wait for the model to load.
+        Returns False (and accepts no jobs) if loading failed.
+        """
+        self._thread = threading.Thread(
+            target=self._run, name="stt-revision", daemon=True
+        )
+        self._thread.start()
+        self._loaded.wait()
+
+        return self.load_error is None
+
+    def submit(
+        self,
+        sentence_id: int,
+        audio: np.ndarray,
+        start_sample: int = 0,
+    ) -> bool:
+        """
+        Queue a sentence for re-transcription. Never blocks the live
+        tier: when the queue is full the sentence keeps its draft text.
+
+        Audio before the end of the previously submitted span is cut
+        off; a span with nothing left is refused.
+        """
+        if not self.running:
+            return False
+
+        overlap = self._last_end_sample - start_sample
+        if overlap > 0:
+            print(
+                f"[STTRevisionWorker] #{sentence_id} overlaps the previous "
+                f"span by {overlap} samples, trimmed"
+            )
+            audio = audio[overlap:]
+            start_sample += overlap
+        if len(audio) == 0:
+            return False
+
+        try:
+            self._jobs.put_nowait((sentence_id, audio, start_sample))
+            self._last_end_sample = start_sample + len(audio)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def close(self) -> None:
+        """
+        Finish queued jobs and stop the thread.
+        """
+        if not self._thread:
+            return
+
+        # Never block on a thread that is gone (e.g. failed model load)
+        while self._thread.is_alive():
+            try:
+                self._jobs.put(None, timeout=0.5)
+                break
+            except queue.Full:
+                continue
+
+        self._thread.join()
+        self._thread = None
+
+    # -------------------------------------------------
+    # INTERNAL
+    # -------------------------------------------------
+
+    def _run(self) -> None:
+        # Linux: niceness is per thread and inherited by threads created
+        # afterwards, so lower it before the model spawns its own threads
+        if hasattr(os, "setpriority"):
+            try:
+                os.setpriority(
+                    os.PRIO_PROCESS, threading.get_native_id(), 19
+                )
+            except OSError:
+                pass
+
+        try:
+            engine = STTEngine(**self._engine_kwargs)
+        except Exception as e:
+            self.load_error = repr(e)
+            print(f"[STTRevisionWorker] Model load failed: {e!r}")
+            return
+        finally:
+            self._loaded.set()
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+
+            sentence_id, audio, start_sample = job
+
+            self.gate.wait_idle()
+
+            try:
+                # Detect afresh per sentence (a whole span beats one window)
+                engine.reset_language()
+                segments = engine.transcribe_timed(audio, start_sample)
+            except Exception as e:
+                print(f"[STTRevisionWorker] #{sentence_id} failed: {e!r}")
+                self._deliver(sentence_id, None)
+                continue
+
+            text = self._normalize(" ".join(s["text"] for s in segments))
+            self._deliver(
+                sentence_id,
+                {
+                    "text": text,
+                    "language": engine.last_language,
+                    "model": self.model_size,
+                    "revised_at": time.time(),
+                }
+                if text
+                else None,
+            )
+
+    def _deliver(
+        self,
+        sentence_id: int,
+        result: Optional[Dict[str, object]],
+    ) -> None:
+        # A failing callback must not kill the thread
+        try:
+            self.on_revised(sentence_id, result)
+        except Exception as e:
+            print(f"[STTRevisionWorker] on_revised failed: {e!r}")
+
+    def _normalize(self, text: str) -> str:
+        text = re.sub(r"\s+", " ", text).strip()
+
+        if not text:
+            return text
+
+        text = text[0].upper() + text[1:]
+        if not text.endswith((".", "!", "?")):
+            text += "."
+
+        return text
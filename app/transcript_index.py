@@ -0,0 +1,341 @@
+# transcript_index.py
+
+import bisect
+import json
+import os
+import re
+import zlib
+from typing import Dict, List, Optional
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_QUERY = re.compile(r'"([^"]+)"|(\S+)')
+
+
+class TranscriptIndex:
+    """
+    Incremental positional inverted index over the committed transcript
+    (raw, refined and translated text).
+
+    Supports term, prefix (word*) and phrase ("a b c") queries; clauses
+    are AND-ed. Persists as a zlib-compressed snapshot of the postings,
+    so reopening never re-tokenizes the transcript.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        autosave_every: int = 50,
+    ):
+        self.path = path
+        self.autosave_every = autosave_every
+
+        # term → sentence_id → field → positions
+        self._postings: Dict[str, Dict[int, Dict[str, List[int]]]] = {}
+        # sentence_id → field → distinct terms (for replacing a field)
+        self._doc_terms: Dict[int, Dict[str, set]] = {}
+        # sentence_id → {"timestamp", "audio_start_sec", "audio_end_sec"}
+        self._meta: Dict[int, Dict[str, Optional[float]]] = {}
+        self._sorted_terms: List[str] = []
+        self._doc_terms_stale = False
+
+        self._unsaved = 0
+
+        if self.path and os.path.exists(self.path):
+            self._load()
+
+        print(
+            f"[TranscriptIndex] Initialized | path={self.path}, "
+            f"sentences={len(self._meta)}, terms={len(self._postings)}"
+        )
+
+    # -------------------------------------------------
+    # INDEXING
+    # -------------------------------------------------
+
+    def add(
+        self,
+        sentence_id: int,
+        field: str,
+        text: str,
+        timestamp: float,
+        audio: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        Index one field of a sentence ("raw", "refined", "translated:tr").
+        Re-adding the same field replaces it.
+        """
+        self._remove_field(sentence_id, field)
+
+        tokens = self.tokenize(text)
+        for pos, term in enumerate(tokens):
+            docs = self._postings.get(term)
+            if docs is None:
+                docs = self._postings[term] = {}
+                bisect.insort(self._sorted_terms, term)
+            docs.setdefault(sentence_id, {}).setdefault(field, []).append(
+                pos
+            )
+
+        self._doc_terms.setdefault(sentence_id, {})[field] = set(tokens)
+
+        meta = self._meta.setdefault(
+            sentence_id,
+            {
+                "timestamp": timestamp,
+                "audio_start_sec": None,
+                "audio_end_sec": None,
+            },
+        )
+        if audio:
+            meta["audio_start_sec"] = audio.get("start_sec")
+            meta["audio_end_sec"] = audio.get("end_sec")
+
+        self._unsaved += 1
+        if self.path and self._unsaved >= self.autosave_every:
+            self.save()
+
+    def _remove_field(self, sentence_id: int, field: str) -> None:
+        if self._doc_terms_stale:
+            self._rebuild_doc_terms()
+
+        fields = self._doc_terms.get(sentence_id)
+        if not fields or field not in fields:
+            return
+
+        for term in fields.pop(field):
+            docs = self._postings[term]
+            docs[sentence_id].pop(field, None)
+            if not docs[sentence_id]:
+                del docs[sentence_id]
+            if not docs:
+                del self._postings[term]
+                idx = bisect.bisect_left(self._sorted_terms, term)
+                del self._sorted_terms[idx]
+
+    def remove_after(self, sentence_id: int) -> None:
+        """
+        Drop every sentence with a larger id (output truncated back to
+        a checkpoint; those sentences are regenerated).
+        """
+        if self._doc_terms_stale:
+            self._rebuild_doc_terms()
+
+        for sid in [s for s in self._meta if s > sentence_id]:
+            for field in list(self._doc_terms.get(sid, {})):
+                self._remove_field(sid, field)
+            self._doc_terms.pop(sid, None)
+            del self._meta[sid]
+
+        self._unsaved += 1
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return [t.lower() for t in _TOKEN.findall(text)]
+
+    # -------------------------------------------------
+    # QUERIES
+    # -------------------------------------------------
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, object]]:
+        """
+        Returns up to `limit` matches in sentence order:
+        {
+            "sentence_id": int,
+            "fields": ["raw", "refined", ...],
+            "timestamp": float,
+            "audio_start_sec": float | None,
+            "audio_end_sec": float | None
+        }
+        """
+        clauses = []
+        for phrase, word in _QUERY.findall(query):
+            if phrase:
+                tokens = self.tokenize(phrase)
+            elif word.endswith("*"):
+                clauses.append(self._prefix_clause(word[:-1].lower()))
+                continue
+            else:
+                # "don't" tokenizes to two terms → treat as a phrase
+                tokens = self.tokenize(word)
+
+            if tokens:
+                clauses.append(self._phrase_clause(tokens))
+
+        if not clauses:
+            return []
+
+        # Drive from the clause with the fewest candidates, verify the
+        # rest per sentence, and stop as soon as `limit` hits are found
+        clauses.sort(key=lambda c: len(c[0]))
+        driver = clauses[0][0]
+
+        hits = []
+        for sentence_id in sorted(driver):
+            fields: set = set()
+            for _, verify in clauses:
+                matched = verify(sentence_id)
+                if not matched:
+                    break
+                fields |= matched
+            else:
+                hits.append(
+                    {
+                        "sentence_id": sentence_id,
+                        "fields": sorted(fields),
+                        **self._meta[sentence_id],
+                    }
+                )
+                if len(hits) >= limit:
+                    break
+
+        return hits
+
+    def _prefix_clause(self, prefix: str):
+        matches: Dict[int, set] = {}
+
+        idx = bisect.bisect_left(self._sorted_terms, prefix)
+        while idx < len(self._sorted_terms):
+            term = self._sorted_terms[idx]
+            if not term.startswith(prefix):
+                break
+            for sid, fields in self._postings[term].items():
+                matches.setdefault(sid, set()).update(fields)
+            idx += 1
+
+        return matches, matches.get
+
+    def _phrase_clause(self, tokens: List[str]):
+        postings = [self._postings.get(t, {}) for t in tokens]
+        rarest = min(postings, key=len)
+
+        def verify(sid: int) -> Optional[set]:
+            docs = [p.get(sid) for p in postings]
+            if not all(docs):
+                return None
+
+            if len(tokens) == 1:
+                return set(docs[0])
+
+            matched = set()
+            for field in set(docs[0]).intersection(*docs[1:]):
+                starts = set(docs[0][field])
+                for offset, doc in enumerate(docs[1:], start=1):
+                    starts &= {pos - offset for pos in doc[field]}
+                    if not starts:
+                        break
+                if starts:
+                    matched.add(field)
+
+            return matched
+
+        return rarest, verify
+
+    # -------------------------------------------------
+    # PERSISTENCE
+    # -------------------------------------------------
+
+    def save(self) -> None:
+        if not self.path:
+            return
+
+        fields: List[str] = []
+        field_ids: Dict[str, int] = {}
+
+        # term → [sentence_id delta, field id, positions delta...] rows
+        postings: Dict[str, List[List[int]]] = {}
+        for term, docs in self._postings.items():
+            rows = []
+            prev_sid = 0
+            for sid in sorted(docs):
+                for field, positions in docs[sid].items():
+                    if field not in field_ids:
+                        field_ids[field] = len(fields)
+                        fields.append(field)
+                    rows.append(
+                        [sid - prev_sid, field_ids[field]]
+                        + self._delta(positions)
+                    )
+                    prev_sid = sid
+            postings[term] = rows
+
+        snapshot = {
+            "version": 1,
+            "fields": fields,
+            "meta": {
+                str(sid): [
+                    m["timestamp"],
+                    m["audio_start_sec"],
+                    m["audio_end_sec"],
+                ]
+                for sid, m in self._meta.items()
+            },
+            "postings": postings,
+        }
+
+        data = zlib.compress(
+            json.dumps(snapshot, separators=(",", ":")).encode("utf-8")
+        )
+
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+        self._unsaved = 0
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as f:
+            snapshot = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+
+        fields = snapshot["fields"]
+
+        for sid, (timestamp, start, end) in snapshot["meta"].items():
+            self._meta[int(sid)] = {
+                "timestamp": timestamp,
+                "audio_start_sec": start,
+                "audio_end_sec": end,
+            }
+
+        for term, rows in snapshot["postings"].items():
+            docs: Dict[int, Dict[str, List[int]]] = {}
+            sid = 0
+            for row in rows:
+                sid += row[0]
+                field = fields[row[1]]
+                docs.setdefault(sid, {})[field] = self._undelta(row[2:])
+            self._postings[term] = docs
+
+        # Only needed to replace a field; built on first use
+        self._doc_terms_stale = True
+
+        self._sorted_terms = sorted(self._postings)
+
+    def _rebuild_doc_terms(self) -> None:
+        self._doc_terms = {}
+        for term, docs in self._postings.items():
+            for sid, fields in docs.items():
+                doc = self._doc_terms.setdefault(sid, {})
+                for field in fields:
+                    doc.setdefault(field, set()).add(term)
+
+        self._doc_terms_stale = False
+
+    @staticmethod
+    def _delta(values: List[int]) -> List[int]:
+        out, prev = [], 0
+        for v in values:
+            out.append(v - prev)
+            prev = v
+        return out
+
+    @staticmethod
+    def _undelta(values: List[int]) -> List[int]:
+        out, total = [], 0
+        for v in values:
+            total += v
+            out.append(total)
+        return out
@@ -1,13 +1,19 @@
 import asyncio
+import os
+import time
 
 from app.fake_blackhole import FakeBlackHole
 from app.audio_buffer_manager import AudioBufferManager
+from app.checkpoint_manager import CheckpointManager
 from app.silence_detector import SilenceDetector
 from app.stt_engine import STTEngine
+from app.stt_pool import STTWorkerPool
+from app.stt_revision_worker import PriorityGate, STTRevisionWorker
 from app.sentence_builder import SentenceBuilder
 from app.llm_client import LLMClient
-from app.llm_commit_queue import OrderedCommitQueue
+from app.meeting_summarizer import RollingSummarizer
 from app.output_manager import OutputManager
+from app.sentence_enricher import SentenceEnricher
 
 
 async def main():
@@ -26,11 +32,28 @@ async def main():
     )
     bh.load()
 
+    # STT_WORKERS > 1 decodes windows in parallel processes (replay / catch-up)
+    stt_workers = int(os.getenv("STT_WORKERS", "1"))
+    # "auto" = detect once per speech turn and cache
+    stt_language = os.getenv("STT_LANGUAGE", "en")
+    stt_model = os.getenv("STT_MODEL", "small")
+
+    # Two-tier STT: a fast greedy draft model live, each finalized
+    # sentence re-transcribed by STT_REVISION_MODEL in the background
+    revision_model = os.getenv("STT_REVISION_MODEL", "")
+    two_tier = bool(revision_model) and stt_workers <= 1
+    if revision_model and not two_tier:
+        print("[Main] STT_REVISION_MODEL ignored with STT_WORKERS > 1")
+
     buffer_manager = AudioBufferManager(
         input_sample_rate=bh.sample_rate,
         target_sample_rate=16000,
         window_size_sec=2.0,
         step_size_sec=1.0,
+        # Keep finalized sentences' audio around for re-transcription
+        history_sec=float(os.getenv("STT_REVISION_HISTORY_SEC", "30"))
+        if two_tier
+        else 0.0,
     )
 
     silence_detector = SilenceDetector(
@@ -39,12 +62,49 @@ async def main():
         silence_duration_ms=500,
     )
 
-    stt = STTEngine(
-        model_size="small",
-        device="cpu",
-        compute_type="int8",
-        language="en",
-    )
+    stt = None
+    stt_pool = None
+    revisor = None
+    stt_gate = None
+
+    if stt_workers > 1:
+        stt_pool = STTWorkerPool(
+            num_workers=stt_workers,
+            model_size=stt_model,
+            device="cpu",
+            compute_type="int8",
+            language=stt_language,
+        )
+    else:
+        stt = STTEngine(
+            model_size=stt_model,
+            device="cpu",
+            compute_type="int8",
+            language=stt_language,
+            beam_size=1 if two_tier else 5,
+        )
+
+    loop = asyncio.get_running_loop()
+
+    if two_tier:
+        stt_gate = PriorityGate()
+        revisor = STTRevisionWorker(
+            on_revised=lambda sid, result: loop.call_soon_threadsafe(
+                enricher.on_revised, sid, result
+            ),
+            gate=stt_gate,
+            model_size=revision_model,
+            device="cpu",
+            compute_type="int8",
+            language=stt_language,
+            cpu_threads=int(os.getenv("STT_REVISION_THREADS", "1")),
+        )
+        if not revisor.start():
+            print("[Main] Revision model unavailable → single-tier STT")
+            revisor = None
+            stt_gate = None
+
+    revision_timeout = float(os.getenv("STT_REVISION_TIMEOUT_SEC", "5"))
 
     builder = SentenceBuilder()
 
@@ -52,83 +112,242 @@ async def main():
     # LLM layer
     # -------------------------
     llm = LLMClient()
-    commit_queue = OrderedCommitQueue()
+
+    # Rolling meeting summary over committed sentences (0 = disabled)
+    summary_block_size = int(os.getenv("SUMMARY_BLOCK_SIZE", "0"))
+    summarizer = (
+        RollingSummarizer(llm, output, block_size=summary_block_size)
+        if summary_block_size > 0
+        else None
+    )
+
+    # Enrichment + order-guaranteed commit of finalized sentences
+    enricher = SentenceEnricher(
+        llm,
+        output,
+        summarizer=summarizer,
+        revision_timeout_sec=revision_timeout,
+    )
 
     sentence_id = 0
     accumulated_silence_ms = 0
+    speech_turn = 0
+    current_language = None if stt_language == "auto" else stt_language
     STEP_MS = 1000
 
-    # 🔑 PENDING TASKS (EN KRİTİK EK)
-    pending_tasks: set[asyncio.Task] = set()
+    # -------------------------
+    # Checkpointing (0 = disabled)
+    # -------------------------
+    checkpoint_interval = float(os.getenv("CHECKPOINT_INTERVAL_SEC", "0"))
+    checkpoint = (
+        CheckpointManager(
+            path=os.getenv("CHECKPOINT_PATH", "output/checkpoint.json"),
+            interval_sec=checkpoint_interval,
+        )
+        if checkpoint_interval > 0
+        else None
+    )
+    audio_cursor = 0  # input frames consumed
 
     # -------------------------
-    # Async LLM worker
+    # Sentence handling (windows arrive in order)
     # -------------------------
-    async def process_llm(sentence_id: int, sentence: str):
-        result = await llm.refine_and_translate(sentence)
-        if result:
-            commit_queue.add_result(sentence_id, result)
+    def on_segments(
+        window: dict,
+        segments: list,
+        stt_done: float,
+        silence_ms: int,
+    ):
+        nonlocal sentence_id, current_language
+
+        if segments and segments[-1].get("language"):
+            current_language = segments[-1]["language"]
+
+        final_sentence = builder.add_segments(
+            segments=segments,
+            silence_ms=silence_ms,
+            captured_at=window["captured_at"],
+        )
 
-        # Commit in order
-        while True:
-            ready = commit_queue.pop_ready()
-            if not ready:
-                break
+        if final_sentence:
+            sentence_id += 1
+
+            marks = {
+                # Window holding the last word, not the finalizing one
+                "captured": builder.last_final_captured_at
+                or window["captured_at"],
+                "stt_done": stt_done,
+                "finalized": time.time(),
+            }
+            audio_span = builder.last_final_span
+
+            print(f"\n🎯 RAW #{sentence_id} → {final_sentence}")
+            output.write_raw(
+                sentence_id,
+                final_sentence,
+                audio_span=audio_span,
+                marks=marks,
+                language=current_language,
+            )
+
+            revising = False
+            if revisor and audio_span:
+                audio = buffer_manager.get_span(
+                    audio_span["start_sample"], audio_span["end_sample"]
+                )
+                revising = audio is not None and revisor.submit(
+                    sentence_id, audio, audio_span["start_sample"]
+                )
 
-            ready_id, ready_result = ready
+            enricher.add_sentence(
+                sentence_id,
+                final_sentence,
+                audio_span=audio_span,
+                marks=marks,
+                language=current_language,
+                expect_revision=revising,
+            )
+            return
 
-            print(f"🧠 LLM OUTPUT #{ready_id} → {ready_result}")
+        # Interim hypothesis for live captions
+        partial = builder.get_partial()
+        if partial:
+            output.write_partial(
+                sentence_id=sentence_id + 1,
+                text=partial["text"],
+                new_words=partial["new_words"],
+                revision=partial["revision"],
+            )
 
-            output.write_llm(
-                sentence_id=ready_id,
-                refined=ready_result["refined_en"],
-                translated=ready_result["translated"],
+    def on_pool_results(results: list):
+        for r in results:
+            on_segments(
+                r["window"],
+                r["segments"],
+                r["stt_done"],
+                r["window"]["silence_ms"],
             )
 
     # -------------------------
     # Audio callback
     # -------------------------
     def on_audio_chunk(chunk):
-        nonlocal accumulated_silence_ms, sentence_id
+        nonlocal accumulated_silence_ms, speech_turn, audio_cursor
 
-        windows = buffer_manager.add_chunk(chunk)
+        windows = buffer_manager.add_chunk_timed(chunk)
         for w in windows:
-            silence = silence_detector.detect(w)
+            silence = silence_detector.detect(w["audio"])
 
             if silence["is_silent"]:
+                # Speech turn ended → re-detect language on the next one
+                if accumulated_silence_ms == 0:
+                    speech_turn += 1
+                    if stt:
+                        stt.reset_language()
                 accumulated_silence_ms += STEP_MS
             else:
                 accumulated_silence_ms = 0
 
-            segments = stt.transcribe(w)
-            final_sentence = builder.add_segments(
-                segments=segments,
-                silence_ms=accumulated_silence_ms,
-            )
+            if stt_pool:
+                stt_pool.submit(
+                    w,
+                    speech_turn=speech_turn,
+                    silence_ms=accumulated_silence_ms,
+                )
+                on_pool_results(stt_pool.pop_ready())
+                continue
 
-            if final_sentence:
-                sentence_id += 1
+            if stt_gate:
+                with stt_gate.live():
+                    segments = stt.transcribe_timed(
+                        w["audio"], w["start_sample"]
+                    )
+            else:
+                segments = stt.transcribe_timed(w["audio"], w["start_sample"])
+            on_segments(w, segments, time.time(), accumulated_silence_ms)
 
-                print(f"\n🎯 RAW #{sentence_id} → {final_sentence}")
-                output.write_raw(sentence_id, final_sentence)
+        audio_cursor += len(chunk)
 
-                task = asyncio.create_task(
-                    process_llm(sentence_id, final_sentence)
-                )
-                pending_tasks.add(task)
-                task.add_done_callback(pending_tasks.discard)
+        if checkpoint and checkpoint.due():
+            save_checkpoint()
+
+    # -------------------------
+    # Checkpoint / resume
+    # -------------------------
+    def save_checkpoint():
+        # Windows still decoding in the pool are not part of any state
+        if stt_pool:
+            on_pool_results(stt_pool.drain())
+
+        checkpoint.save(
+            {
+                "audio_cursor": audio_cursor,
+                "output_offset": output.tell(),
+                "buffer": buffer_manager.state_dict(),
+                "builder": builder.state_dict(),
+                "sentence_id": sentence_id,
+                "accumulated_silence_ms": accumulated_silence_ms,
+                "speech_turn": speech_turn,
+                "current_language": current_language,
+                "enricher": enricher.state_dict(),
+                "summarizer": summarizer.state_dict() if summarizer else None,
+            }
+        )
+
+    state = checkpoint.load() if checkpoint else None
+    if state:
+        # Records after the checkpoint are regenerated, not duplicated
+        output.truncate(
+            state["output_offset"], last_sentence_id=state["sentence_id"]
+        )
+
+        buffer_manager.load_state(state["buffer"])
+        builder.load_state(state["builder"])
+
+        audio_cursor = state["audio_cursor"]
+        sentence_id = state["sentence_id"]
+        accumulated_silence_ms = state["accumulated_silence_ms"]
+        speech_turn = state["speech_turn"]
+        current_language = state["current_language"]
+
+        if summarizer and state["summarizer"]:
+            summarizer.load_state(state["summarizer"])
+
+        # Re-issues only LLM work whose result never arrived
+        reissued = enricher.load_state(state["enricher"])
+
+        print(
+            f"[Main] Resumed | audio_cursor={audio_cursor}, "
+            f"next_sentence_id={sentence_id + 1}, "
+            f"llm_reissued={reissued}"
+        )
 
     # -------------------------
     # Run
     # -------------------------
-    bh.stream(on_audio_chunk)
+    bh.stream(on_audio_chunk, start_frame=audio_cursor)
+
+    if stt_pool:
+        on_pool_results(stt_pool.drain())
+        stt_pool.close()
+
+    if enricher.pending_tasks:
+        print(f"[Main] Waiting for {len(enricher.pending_tasks)} LLM tasks...")
+        await enricher.wait(timeout=15)
 
-    if pending_tasks:
-        print(f"[Main] Waiting for {len(pending_tasks)} LLM tasks...")
-        await asyncio.wait(pending_tasks, timeout=15)
+    if revisor:
+        revisor.close()
+        # Deliver revisions that arrived after their LLM task gave up
+        await asyncio.sleep(0)
+
+    if summarizer:
+        await summarizer.flush()
 
     output.close()
 
+    if checkpoint:
+        checkpoint.clear()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,46 @@
+import asyncio
+
+from app.fake_blackhole import FakeBlackHole
+from app.pcm_ingest_server import PCMIngestServer, send_pcm
+
+
+async def run():
+    bh = FakeBlackHole(
+        wav_path="audio/test01_20s.wav",
+        frame_size=1024,
+        realtime=False,
+    )
+    bh.load()
+
+    def on_windows(session, windows):
+        for w in windows:
+            print(
+                f"[{session.session_id}] Window produced: "
+                f"shape={w['audio'].shape}, start={w['start_sample']}"
+            )
+
+    server = PCMIngestServer(on_windows=on_windows, port=0)
+    await server.start()
+
+    # Two capture agents: float32 as loaded, and the same audio as int16
+    pcm_int16 = (bh.audio * 32767).astype("int16")
+
+    await asyncio.gather(
+        send_pcm("127.0.0.1", server.port, "agent-f32", bh.audio, bh.sample_rate),
+        send_pcm("127.0.0.1", server.port, "agent-i16", pcm_int16, bh.sample_rate),
+    )
+
+    await asyncio.sleep(0.5)
+
+    for session_id, session in server.sessions.items():
+        print(f"{session_id}: {session.stats()}")
+
+    await server.stop()
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
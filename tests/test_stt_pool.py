@@ -0,0 +1,55 @@
+from app.fake_blackhole import FakeBlackHole
+from app.audio_buffer_manager import AudioBufferManager
+from app.stt_pool import STTWorkerPool
+
+
+def main():
+    bh = FakeBlackHole(
+        wav_path="audio/test01_20s.wav",
+        frame_size=1024,
+        realtime=False,
+    )
+    bh.load()
+
+    buffer_manager = AudioBufferManager(
+        input_sample_rate=bh.sample_rate,
+        target_sample_rate=16000,
+        window_size_sec=2.0,
+        step_size_sec=1.0,
+    )
+
+    pool = STTWorkerPool(
+        num_workers=4,
+        model_size="small",
+        device="cpu",
+        compute_type="int8",
+        language="en",
+    )
+
+    window_index = 0
+
+    def print_results(results):
+        nonlocal window_index
+
+        for r in results:
+            window_index += 1
+            print(
+                f"\n[STT] Window #{window_index} "
+                f"@ {r['window']['start_sample']}"
+            )
+            for s in r["segments"]:
+                print(f"  → {s['text']}")
+
+    def on_audio_chunk(chunk):
+        for w in buffer_manager.add_chunk_timed(chunk):
+            pool.submit(w)
+            print_results(pool.pop_ready())
+
+    bh.stream(on_audio_chunk)
+
+    print_results(pool.drain())
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
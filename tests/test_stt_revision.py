@@ -0,0 +1,94 @@
+import time
+
+from app.fake_blackhole import FakeBlackHole
+from app.audio_buffer_manager import AudioBufferManager
+from app.sentence_builder import SentenceBuilder
+from app.stt_engine import STTEngine
+from app.stt_revision_worker import PriorityGate, STTRevisionWorker
+
+
+def main():
+    bh = FakeBlackHole(
+        wav_path="audio/test01_20s.wav",
+        frame_size=1024,
+        realtime=False,
+    )
+    bh.load()
+
+    buffer_manager = AudioBufferManager(
+        input_sample_rate=bh.sample_rate,
+        target_sample_rate=16000,
+        window_size_sec=2.0,
+        step_size_sec=1.0,
+        history_sec=30.0,
+    )
+
+    # Live tier: small model, greedy
+    draft = STTEngine(
+        model_size="base",
+        device="cpu",
+        compute_type="int8",
+        language="en",
+        beam_size=1,
+    )
+
+    gate = PriorityGate()
+    drafts = {}
+
+    def on_revised(sentence_id, result):
+        revised = result["text"] if result else None
+        print(f"\n[REVISED] #{sentence_id}")
+        print(f"  draft   → {drafts[sentence_id]}")
+        print(f"  revised → {revised}")
+
+    revisor = STTRevisionWorker(
+        on_revised=on_revised,
+        gate=gate,
+        model_size="small",
+        language="en",
+    )
+    revisor.start()
+
+    builder = SentenceBuilder()
+    sentence_id = 0
+    last_end = 0
+
+    def on_audio_chunk(chunk):
+        nonlocal sentence_id, last_end
+
+        for w in buffer_manager.add_chunk_timed(chunk):
+            with gate.live():
+                segments = draft.transcribe_timed(
+                    w["audio"], w["start_sample"]
+                )
+
+            sentence = builder.add_segments(segments, silence_ms=0)
+            if not sentence:
+                continue
+
+            sentence_id += 1
+            drafts[sentence_id] = sentence
+            print(f"\n[DRAFT] #{sentence_id} → {sentence}")
+
+            span = builder.last_final_span
+
+            # Revised text must not repeat the previous sentence's end
+            assert span["start_sample"] >= last_end, (span, last_end)
+            last_end = span["end_sample"]
+
+            audio = buffer_manager.get_span(
+                span["start_sample"], span["end_sample"]
+            )
+            if audio is not None:
+                revisor.submit(sentence_id, audio, span["start_sample"])
+
+    start = time.time()
+    bh.stream(on_audio_chunk)
+    print(f"\nLive tier done in {time.time() - start:.2f}s")
+
+    revisor.close()
+    print(f"All revisions done in {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
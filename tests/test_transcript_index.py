@@ -0,0 +1,48 @@
+import json
+import time
+
+from app.transcript_index import TranscriptIndex
+
+
+def main():
+    index = TranscriptIndex()
+
+    with open("output/transcript.jsonl", "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+
+            if record["type"] == "raw":
+                index.add(
+                    record["sentence_id"],
+                    "raw",
+                    record["text"],
+                    record["timestamp"],
+                    record.get("audio"),
+                )
+            elif record["type"] == "llm":
+                index.add(
+                    record["sentence_id"],
+                    "refined",
+                    record["refined_en"],
+                    record["timestamp"],
+                )
+                for lang, text in (record.get("translations") or {}).items():
+                    index.add(
+                        record["sentence_id"],
+                        f"translated:{lang}",
+                        text,
+                        record["timestamp"],
+                    )
+
+    for query in ["today", '"who will"', "tod*", '"will i be" today']:
+        started = time.perf_counter()
+        hits = index.search(query)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        print(f"\n[Index] {query!r} → {len(hits)} hits ({elapsed_ms:.3f}ms)")
+        for hit in hits[:5]:
+            print(f"  → {hit}")
+
+
+if __name__ == "__main__":
+    main()